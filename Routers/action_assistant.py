@@ -2,10 +2,14 @@ import json
 import traceback
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from utils.code_helper import graph, system_message
-from langchain_core.messages import SystemMessage, HumanMessage
+from utils.code_helper import get_graph, system_message, stream_function
+from utils.tool_batch import TOOL_BATCH_MAX_ITEMS, build_tools
+from utils.code_validation import validation_stats
+from utils.tool_sandbox import smoke_test, SandboxUnavailable
+from utils.cache import etag_matches
 
 from models import *
 from Routers.auth import verify_basic_auth
@@ -26,27 +30,30 @@ async def get_available_actions(auth: str = Depends(verify_basic_auth)):
 
 
 @actions.get("/action-template")
-async def get_action_template(action_name: str, external_api_call: bool = False, current_date_code: bool = False, update_dashboard_code: bool = False, upload_recording_code: bool = False, auth: str = Depends(verify_basic_auth)):
-    """ This end point provides action templates """
+async def get_action_template(request: Request, action_name: str, external_api_call: bool = False, current_date_code: bool = False, update_dashboard_code: bool = False, upload_recording_code: bool = False, auth: str = Depends(verify_basic_auth)):
+    """ This end point provides action templates (served pre-serialized from the template catalog) """
 
     try:
-        if action_name == "pre_call":
-            return get_pre_call_template(external_api_call, current_date_code)
-        
-        elif action_name == "post_call":
-            return get_post_call_template(external_api_call, update_dashboard_code, upload_recording_code)
-        
-        elif action_name == "get_current_date_time_tool":
-            return get_tool_current_date_time()
-        
-        elif action_name == "convert_digit_to_words_tool":
-            return get_tool_digits_to_words()
-        
-        else:
+        template = lookup_template(
+            action_name,
+            external_api_call=external_api_call,
+            current_date_code=current_date_code,
+            update_dashboard_code=update_dashboard_code,
+            upload_recording_code=upload_recording_code
+        )
+
+        if template is None:
             return {
                 "message": "pass valid action name"
             }
 
+        body, etag = template
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
@@ -71,24 +78,57 @@ async def get_functions(user_req: function_request, auth: str = Depends(verify_b
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
     
 
+@actions.post("/smoke-test")
+async def smoke_test_function(user_req: smoke_test_request, auth: str = Depends(verify_basic_auth)):
+    """ This end point runs a generated tool in a sandbox against a local HTTP stub """
+
+    try:
+        dynamic_map = json.loads(user_req.dynamic_map) if user_req.dynamic_map else None
+
+        return await smoke_test(
+            user_req.python_code,
+            user_req.sample_args,
+            user_req.curl_command,
+            dynamic_map,
+            user_req.stub_response,
+            user_req.stub_status
+        )
+
+    except SandboxUnavailable as e:
+        print(f"\nError: {e}")
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "unavailable", "error": str(e)})
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
+
+
+def build_tool_inputs(user_req: tool_request):
+    """ (uu_id, graph inputs, graph config) for a build-tool request """
+    from langchain_core.messages import SystemMessage, HumanMessage
+
+    user_prompt = user_req.user_prompt
+    uu_id = user_req.uu_id
+
+    if not uu_id:
+        uu_id = str(uuid4())
+        inputs = {"messages": [HumanMessage(content=user_prompt)]}
+
+    else:
+        inputs = {"messages": [SystemMessage(content=system_message), HumanMessage(content=user_prompt)]}
+
+    return uu_id, inputs, {"configurable": {"thread_id": uu_id}}
+
+
 @actions.post("/build-tool")
 async def build_function(user_req: tool_request, auth: str = Depends(verify_basic_auth)):
     """ This end point serve AI Assist """
 
     try:
-        user_prompt = user_req.user_prompt
-        uu_id = user_req.uu_id
+        uu_id, inputs, config = build_tool_inputs(user_req)
 
-        if not uu_id:
-            uu_id = str(uuid4())
-            config = {
-                "configurable": {"thread_id": uu_id}
-            }
-
-            result = graph.invoke({"messages": [HumanMessage(content=user_prompt)]}, config=config)
-            
-        else:
-            result = graph.invoke({"messages": [SystemMessage(content=system_message), HumanMessage(content=user_prompt)]}, config={"configurable": {"thread_id": uu_id}})
+        graph = await get_graph()
+        result = await graph.ainvoke(inputs, config=config)
 
         return {
             "result": result["messages"][-1].content,
@@ -97,4 +137,111 @@ async def build_function(user_req: tool_request, auth: str = Depends(verify_basi
     
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
-        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
\ No newline at end of file
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
+
+
+@actions.post("/build-tool/batch")
+async def build_function_batch(
+    user_req: tool_batch_request,
+    stream: bool = Query(False, description="stream NDJSON results as each tool completes"),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ Batch AI Assist: generates one tool per requirement concurrently, with per-item errors """
+
+    if not user_req.user_prompts:
+        return JSONResponse(status_code=422, content="user_prompts is empty")
+
+    if len(user_req.user_prompts) > TOOL_BATCH_MAX_ITEMS:
+        return JSONResponse(status_code=422, content=f"At most {TOOL_BATCH_MAX_ITEMS} requirements per batch")
+
+    if stream:
+        async def stream_results():
+            async for result in build_tools(user_req.user_prompts):
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    try:
+        results = [result async for result in build_tools(user_req.user_prompts)]
+        results.sort(key=lambda result: result["index"])
+        succeeded = sum(1 for result in results if result["status"] == "Success")
+        invalid = sum(1 for result in results if result["status"] == "Invalid")
+
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "invalid": invalid,
+            "failed": len(results) - succeeded - invalid,
+            "results": results
+        }
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error!")
+
+
+def format_event(event: str, data: dict, sse: bool):
+    payload = json.dumps(data, ensure_ascii=False)
+
+    if sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+
+    return json.dumps({"event": event, **data}, ensure_ascii=False) + "\n"
+
+
+async def stream_build_events(inputs: dict, config: dict, uu_id: str, sse: bool):
+    yield format_event("start", {"uu_id": uu_id}, sse)
+
+    try:
+        async for event, data in stream_function(inputs, config):
+            if event == "delta":
+                yield format_event("delta", {"content": data}, sse)
+            elif event == "retry":
+                yield format_event("retry", {"validation_errors": data}, sse)
+            else:
+                yield format_event("result", {"result": data, "uu_id": uu_id}, sse)
+
+    except Exception as e:
+        # the response has already started, so the error is reported in-stream
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        yield format_event("error", {"detail": "Internal Server Error!"}, sse)
+
+
+@actions.post("/build-tool/stream")
+async def build_function_stream(
+    user_req: tool_request,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson lines or text/event-stream"),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ Streaming AI Assist: emits start, LLM output deltas as they are generated, retry if the code failed validation, then the final result """
+
+    uu_id, inputs, config = build_tool_inputs(user_req)
+    sse = format == "sse"
+
+    return StreamingResponse(
+        stream_build_events(inputs, config, uu_id, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@actions.get("/build-tool/history-stats")
+async def get_history_stats(auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to get conversation history compaction counters (this worker) """
+    from utils.history_compaction import compaction_stats
+
+    return compaction_stats
+
+
+@actions.get("/build-tool/cache-stats")
+async def get_tool_cache_stats(auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to get generated tool cache hit/miss counters (this worker) """
+    from utils.tool_cache import tool_cache
+
+    return tool_cache.get_stats()
+
+
+@actions.get("/build-tool/validation-stats")
+async def get_validation_stats(auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to get generated code validation counters (this worker) """
+    return validation_stats
\ No newline at end of file
@@ -0,0 +1,36 @@
+import os
+import traceback
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+
+from utils.mongo import MongoManager, get_mongo
+
+
+health = APIRouter(
+    prefix="/prompt",
+    tags=["Health"]
+)
+
+
+@health.get("/health")
+async def liveness(mongo: MongoManager = Depends(get_mongo)):
+    """ Liveness probe: the process is serving requests (does not touch the database) """
+    return {"status": "ok", "worker_pid": os.getpid(), "mongo_pool": mongo.stats()}
+
+
+@health.get("/ready")
+async def readiness(mongo: MongoManager = Depends(get_mongo)):
+    """ Readiness probe: MongoDB answers a ping; 503 until it does """
+    try:
+        ping_ms = await mongo.ping()
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={
+            "status": "unavailable",
+            "error": f"{type(e).__name__}: {e}",
+            "mongo_pool": mongo.stats()
+        })
+
+    return {"status": "ready", "mongo_ping_ms": ping_ms, "mongo_pool": mongo.stats()}
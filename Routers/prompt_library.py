@@ -1,25 +1,21 @@
-import os
-import re
 import traceback
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-
-from pymongo import MongoClient
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from bson.objectid import ObjectId
 
 from models import *
 from Routers.auth import verify_basic_auth
 from action_template import *
-from utils.prompt_utils import evaluate_prompt
-
-
-DB_URI = os.getenv("DB_URI")
-
-conn = MongoClient(DB_URI)
-db = conn["vb_platform"]
-prompt_library = db["prompt_library"]
+from utils.evaluation_cache import evaluate_prompt_cached, get_cache_stats
+from utils.prompt_repository import PromptRepository, prompt_repo, prompts_query, listing_projection, library_query, get_prompt_repo, get_listing_repo
+from utils.prompt_export import export_ndjson
+from utils.prompt_import import build_prompt_document, bulk_import_prompts, iter_import_records
+from utils.prompt_search import search_prompts
+from utils.prompt_embeddings import similarity_index, with_prompt_metadata
+from utils.evaluation_jobs import BACKGROUND_EVALUATION, PENDING_ACCURACY, enqueue_evaluation, get_evaluation_job
+from utils.cache import library_cache, etag_matches
 
 
 library = APIRouter(
@@ -28,37 +24,107 @@ library = APIRouter(
 )
 
 
+PROMPT_FIELDS = {"prompt", "prompt_accuracy", "service_type", "agent_type", "language", "use_case"}
+COMPONENT_FIELDS = {"prompt_component", "accuracy"}
+
+
+async def invalidate_library_cache(action: str, doc_id, fields):
+    """ drop only the cached responses a library write can affect """
+    if action == "delete":
+        namespaces = {"prompts", "prompt_components", "facets"}
+
+    elif action == "insert_many":
+        namespaces = {"prompts", "facets"}
+
+    elif action == "insert":
+        namespaces = {"prompt_components"} if fields.get("component_type") == "prompt_component" else {"prompts", "facets"}
+
+    else:
+        namespaces = set()
+
+        if PROMPT_FIELDS & fields.keys():
+            namespaces.add("prompts")
+
+        if {"service_type", "language"} & fields.keys():
+            namespaces.add("facets")
+
+        if COMPONENT_FIELDS & fields.keys():
+            namespaces.add("prompt_components")
+
+    await library_cache.invalidate(*sorted(namespaces))
+
+
+prompt_repo.add_change_listener(invalidate_library_cache)
+
+
+async def cached_json(request: Request, namespace: str, params: dict, loader):
+    """ serve loader() -> (content, headers) through the read-through cache; a matching If-None-Match gets a 304 """
+    entry = await library_cache.get_or_load(namespace, params, loader)
+    headers = {**entry["headers"], "ETag": entry["etag"]}
+
+    if etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+async def get_listing_page(repo: PromptRepository, db_query: dict, id_field: str, after: str, limit: int, projection: dict, include_total: bool):
+    """ fetch one keyset page; returns (documents, X-Next-Cursor / X-Total-Count headers) """
+    docs, next_cursor = await repo.find_page(db_query, after, limit, projection)
+    headers = {}
+
+    for doc in docs:
+        doc[id_field] = str(doc.pop("_id"))
+
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+
+    if include_total:
+        headers["X-Total-Count"] = str(await repo.count(db_query))
+
+    return docs, headers
+
+
 @library.get("/prompt-components")
-async def get_prompt_components(auth: str = Depends(verify_basic_auth)):
-    """ This is end poin to get available prompts components """
+async def get_prompt_components(
+    request: Request,
+    after: str = None,
+    limit: int = Query(None, ge=1, le=500),
+    fields: str = None,
+    metadata_only: bool = False,
+    include_total: bool = False,
+    repo: PromptRepository = Depends(get_listing_repo),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ This is end poin to get available prompts components (paginate with after=<X-Next-Cursor> & limit) """
     try:
-        prompts = list(prompt_library.find({"component_type": "prompt_component"}))
+        if after and not ObjectId.is_valid(after):
+            return JSONResponse(status_code=422, content="Invalid cursor")
 
-        for doc in prompts:
-            doc["prompt_component_id"] = str(doc.get("_id"))
-            del doc["_id"]
+        projection = listing_projection("prompt_component", fields, metadata_only)
+        params = {"after": after, "limit": limit, "fields": fields, "metadata_only": metadata_only, "include_total": include_total}
 
-        return prompts
+        return await cached_json(
+            request, "prompt_components", params,
+            lambda: get_listing_page(repo, {"component_type": "prompt_component"}, "prompt_component_id", after, limit, projection, include_total)
+        )
     
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
 
 
+async def facet_content(repo: PromptRepository, field: str):
+    return await repo.get_facet(field), None
+
+
 @library.get("/get-service-types")
-async def get_service_types(auth: str = Depends(verify_basic_auth)):
+async def get_service_types(request: Request, repo: PromptRepository = Depends(get_listing_repo), auth: str = Depends(verify_basic_auth)):
     """ This is end poin to get available industry for prompts """
 
     try:
         # get available industries from DB
-        service_types_record = prompt_library.find({"component_type": "prompt"}, {"service_type": 1, "_id": 0})
-
-        service_types = []
-
-        for doc in service_types_record:
-            service_types.append(doc.get("service_type"))
-
-        return set(service_types)
+        return await cached_json(request, "facets", {"field": "service_type"}, lambda: facet_content(repo, "service_type"))
     
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
@@ -66,19 +132,12 @@ async def get_service_types(auth: str = Depends(verify_basic_auth)):
 
 
 @library.get("/get-prompt-languages")
-async def get_prompt_languages(auth: str = Depends(verify_basic_auth)):
+async def get_prompt_languages(request: Request, repo: PromptRepository = Depends(get_listing_repo), auth: str = Depends(verify_basic_auth)):
     """ This is end poin to get available languages for prompts """
 
     try:
         # get available prompts from DB
-        languages_records = prompt_library.find({"component_type": "prompt"}, {"language": 1, "_id": 0})
-
-        languages = []
-
-        for doc in languages_records:
-            languages.append(doc.get("language"))
-
-        return set(languages)
+        return await cached_json(request, "facets", {"field": "language"}, lambda: facet_content(repo, "language"))
     
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
@@ -86,56 +145,188 @@ async def get_prompt_languages(auth: str = Depends(verify_basic_auth)):
     
 
 @library.get("/prompts")
-async def get_prompts(service_type: str, language: str = None, auth: str = Depends(verify_basic_auth)):
-    """ This end point for prompt library """
+async def get_prompts(
+    request: Request,
+    service_type: str,
+    language: str = None,
+    prefix: bool = False,
+    after: str = None,
+    limit: int = Query(None, ge=1, le=500),
+    fields: str = None,
+    metadata_only: bool = False,
+    include_total: bool = False,
+    repo: PromptRepository = Depends(get_listing_repo),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ This end point for prompt library; service_type & language match case-insensitively (exact, or as prefix when prefix=true) """
 
     try:
+        if after and not ObjectId.is_valid(after):
+            return JSONResponse(status_code=422, content="Invalid cursor")
+
         # get prompts from DB for selected industry
-        db_query = {"service_type": {"$regex": re.compile(service_type, re.IGNORECASE)}}
+        db_query = prompts_query(service_type, language, prefix)
+
+        projection = listing_projection("prompt", fields, metadata_only)
+        params = {
+            "service_type": service_type.strip().lower(),
+            "language": language.strip().lower() if language else None,
+            "prefix": prefix, "after": after, "limit": limit, "fields": fields,
+            "metadata_only": metadata_only, "include_total": include_total
+        }
+
+        return await cached_json(
+            request, "prompts", params,
+            lambda: get_listing_page(repo, db_query, "prompt_id", after, limit, projection, include_total)
+        )
+    
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
+    
+# === search endpoint === #
+@library.get("/prompts/search")
+async def search_prompt_library(
+    q: str = Query(..., min_length=1),
+    service_type: str = None,
+    language: str = None,
+    component_type: Literal["prompt", "prompt_component"] = None,
+    fuzzy: bool = False,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ Endpoint to search prompt bodies & use cases, ranked by relevance with highlighted snippets (fuzzy=true needs PROMPT_SEARCH_BACKEND=memory) """
+    try:
+        filters = {}
+
+        if service_type:
+            filters["service_type"] = service_type.strip().lower()
 
         if language:
-            db_query.update({"language": re.compile(language, re.IGNORECASE)})
+            filters["language"] = language.strip().lower()
 
-        available_prompt = list(prompt_library.find(db_query))
+        if component_type:
+            filters["component_type"] = component_type
 
-        for doc in available_prompt:
-            doc["prompt_id"] = str(doc.get("_id"))
-            del doc["_id"]
+        results = await search_prompts(q, filters, skip, limit, fuzzy)
+
+        for doc in results:
+            id_field = "prompt_component_id" if doc.get("component_type") == "prompt_component" else "prompt_id"
+            doc[id_field] = str(doc.pop("_id"))
+
+        return results
 
-        return available_prompt
-    
     except Exception as e:
         print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
-    
+
+
+# === similar prompts endpoint === #
+@library.get("/prompts/similar")
+async def get_similar_prompts(
+    prompt_id: str = None,
+    text: str = None,
+    service_type: str = None,
+    top_k: int = Query(5, ge=1, le=50),
+    auth: str = Depends(verify_basic_auth)
+):
+    """ Endpoint to get prompts most similar to an existing prompt (prompt_id) or to a given text """
+    try:
+        if not prompt_id and not text:
+            return JSONResponse(status_code=422, content="Pass either prompt_id or text")
+
+        matches = await similarity_index.similar(text, prompt_id, top_k, service_type)
+
+        if matches is None:
+            return JSONResponse(status_code=404, content={
+                "prompt_id": prompt_id,
+                "status": "Failed",
+                "content": f"No prompt found with id: {prompt_id}"
+            })
+
+        return await with_prompt_metadata(matches)
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
+
+
+# === export endpoint === #
+@library.get("/prompts/export")
+async def export_prompt_library(
+    service_type: str = None,
+    language: str = None,
+    prefix: bool = False,
+    component_type: Literal["prompt", "prompt_component"] = None,
+    compress: bool = False,
+    auth: str = Depends(verify_basic_auth)
+):
+    """ Endpoint to stream the prompt library as NDJSON (service_type / language filters behave as in /prompts; all given filters apply) """
+    try:
+        db_query = library_query(component_type, service_type, language, prefix)
+
+        file_name = "prompt_library.ndjson.gz" if compress else "prompt_library.ndjson"
+
+        return StreamingResponse(
+            export_ndjson(db_query, compress),
+            media_type="application/gzip" if compress else "application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+        )
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
+
+
 # === insertion endpoints === #
 @library.post("/prompts/add-prompt")
-async def insert_prompt(user_req: new_prompt, auth: str = Depends(verify_basic_auth)):
-    """ Endpoint to insert new prompt """
+async def insert_prompt(user_req: new_prompt, check_duplicates: bool = False, repo: PromptRepository = Depends(get_prompt_repo), auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to insert new prompt (check_duplicates=true rejects near-duplicates within the service type) """
     try:
         user_req = user_req.model_dump()
 
         prompt = user_req.get("prompt")
 
-        insert_query = {
-            "service_type": user_req.get("service_type", "").capitalize(),
-            "prompt_accuracy": "",
-            "prompt": prompt,
-            "agent_type": user_req.get("agent_type"),
-            "use_case": user_req.get("use_case").capitalize(),
-            "language": user_req.get("language").capitalize(),
-            "component_type": "prompt"
-        }
+        insert_query = build_prompt_document(user_req)
+
+        if check_duplicates:
+            duplicates = await similarity_index.find_duplicates(prompt, insert_query["service_type"])
+
+            if duplicates:
+                return JSONResponse(
+                    status_code=409,
+                    content={
+                        "status": "Failed",
+                        "content": "Similar prompt already exists",
+                        "duplicates": await with_prompt_metadata(duplicates)
+                    }
+                )
+
+        if BACKGROUND_EVALUATION:
+            # persist now; accuracy is filled in by the evaluation workers
+            insert_query["prompt_accuracy"] = PENDING_ACCURACY
+            prompt_id = await repo.insert_one(insert_query)
+            job_id = await enqueue_evaluation(prompt_id, prompt, "prompt", "prompt_accuracy")
+
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "status": "Success",
+                    "prompt_id": str(prompt_id),
+                    "evaluation_job_id": job_id
+                }
+            )
 
         # evaluate the prompt & get prompt accuracy
-        prompt_evaluation = evaluate_prompt(prompt)
+        prompt_evaluation = await evaluate_prompt_cached(prompt)
         accuracy = prompt_evaluation.get("accuracy")
         insert_query["prompt_accuracy"] = accuracy
 
         # if float(accuracy) < 70:
         #     return JSONResponse(status_code=200, content="Prompt should score more than 70% accuracy to get inserted!")
 
-        prompt_library.insert_one(insert_query)
+        await repo.insert_one(insert_query)
 
         return JSONResponse(
             status_code=200,
@@ -149,8 +340,24 @@ async def insert_prompt(user_req: new_prompt, auth: str = Depends(verify_basic_a
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
     
 
+@library.post("/prompts/bulk-import")
+async def bulk_import(request: Request, auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to insert many prompts at once; body is a JSON array or NDJSON (Content-Type: application/x-ndjson) of new_prompt records """
+    try:
+        report = await bulk_import_prompts(iter_import_records(request))
+
+        return JSONResponse(status_code=200, content=report)
+
+    except ValueError as e:
+        return JSONResponse(status_code=422, content=f"Invalid bulk import body: {e}")
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
+    
+
 @library.post("/prompts/add-prompt-component")
-async def insert_prompt_component(user_req: new_prompt_component, auth: str = Depends(verify_basic_auth)):
+async def insert_prompt_component(user_req: new_prompt_component, repo: PromptRepository = Depends(get_prompt_repo), auth: str = Depends(verify_basic_auth)):
     """ Endpoint to insert new prompt component """
     try:
         user_req = user_req.model_dump()
@@ -163,12 +370,27 @@ async def insert_prompt_component(user_req: new_prompt_component, auth: str = De
             "component_type": "prompt_component"
         }
 
+        if BACKGROUND_EVALUATION:
+            # persist now; accuracy is filled in by the evaluation workers
+            insert_query["accuracy"] = PENDING_ACCURACY
+            component_id = await repo.insert_one(insert_query)
+            job_id = await enqueue_evaluation(component_id, prompt_component, "prompt_component", "accuracy")
+
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "status": "Success",
+                    "prompt_component_id": str(component_id),
+                    "evaluation_job_id": job_id
+                }
+            )
+
         # evaluate the prompt & get prompt accuracy
-        prompt_evaluation = evaluate_prompt(prompt_component)
+        prompt_evaluation = await evaluate_prompt_cached(prompt_component)
         accuracy = prompt_evaluation.get("accuracy")
         insert_query["accuracy"] = accuracy
 
-        prompt_library.insert_one(insert_query)
+        await repo.insert_one(insert_query)
 
         return JSONResponse(
             status_code=200,
@@ -184,7 +406,7 @@ async def insert_prompt_component(user_req: new_prompt_component, auth: str = De
 
 # === updation endpoints === #
 @library.post("/prompts/update-prompt")
-async def update_prompt(user_req: update_prompt_request, auth: str = Depends(verify_basic_auth)):
+async def update_prompt(user_req: update_prompt_request, repo: PromptRepository = Depends(get_prompt_repo), auth: str = Depends(verify_basic_auth)):
     """ Endpoint to update the prompt """
     try:
         user_req = user_req.model_dump()
@@ -198,10 +420,15 @@ async def update_prompt(user_req: update_prompt_request, auth: str = Depends(ver
             return JSONResponse(status_code=422, content="Invalid prompt ID")
 
         update_query = {}
+        job_id = None
         
-        if prompt:
+        if prompt and BACKGROUND_EVALUATION:
+            update_query["prompt"] = prompt
+            update_query["prompt_accuracy"] = PENDING_ACCURACY
+
+        elif prompt:
             # evaluate the prompt & get prompt accuracy
-            prompt_evaluation = evaluate_prompt(prompt)
+            prompt_evaluation = await evaluate_prompt_cached(prompt)
             accuracy = prompt_evaluation.get("accuracy")
             update_query["prompt"] = prompt
             update_query["prompt_accuracy"] = accuracy
@@ -219,10 +446,13 @@ async def update_prompt(user_req: update_prompt_request, auth: str = Depends(ver
             update_query["use_case"] = user_req.get("use_case")
 
         if update_query:
-            result = prompt_library.update_one({"_id": ObjectId(prompt_id)}, {"$set": update_query})
+            modified_count = await repo.update_by_id(prompt_id, update_query)
 
-            if result.modified_count == 1:
+            if modified_count == 1:
                 print(f"prompt with prompt id: {prompt_id} successfully updated!")
+
+                if prompt and BACKGROUND_EVALUATION:
+                    job_id = await enqueue_evaluation(prompt_id, prompt, "prompt", "prompt_accuracy")
             else:
                 print(f"No prompt found with prompt id: {prompt_id}")
                 return JSONResponse(
@@ -233,10 +463,15 @@ async def update_prompt(user_req: update_prompt_request, auth: str = Depends(ver
                     }
                 )
 
-        return JSONResponse(status_code=200, content={
+        content = {
             "prompt_id": prompt_id,
             "status": "Success"
-        })
+        }
+
+        if job_id:
+            content["evaluation_job_id"] = job_id
+
+        return JSONResponse(status_code=200, content=content)
 
     except Exception as e:
         print(f"Error: {e}")
@@ -244,7 +479,7 @@ async def update_prompt(user_req: update_prompt_request, auth: str = Depends(ver
     
 
 @library.post("/prompts/update-prompt-conponent")
-async def update_prompt_component(user_req: update_prompt_component_request, auth: str = Depends(verify_basic_auth)):
+async def update_prompt_component(user_req: update_prompt_component_request, repo: PromptRepository = Depends(get_prompt_repo), auth: str = Depends(verify_basic_auth)):
     
     try:
         user_req = user_req.model_dump()
@@ -256,18 +491,22 @@ async def update_prompt_component(user_req: update_prompt_component_request, aut
         if not ObjectId.is_valid(component_id):
             return JSONResponse(status_code=422, content="Invalid prompt ID")
 
-        # evaluate prompt component & get accuracy
-        component_evaluation = evaluate_prompt(prompt_component)
-        accuracy = component_evaluation.get("accuracy")
+        if BACKGROUND_EVALUATION:
+            accuracy = PENDING_ACCURACY
+
+        else:
+            # evaluate prompt component & get accuracy
+            component_evaluation = await evaluate_prompt_cached(prompt_component)
+            accuracy = component_evaluation.get("accuracy")
 
         update_query = {
             "prompt_component": prompt_component,
             "accuracy": accuracy
         }
 
-        result = prompt_library.update_one({"_id": ObjectId(component_id)}, {"$set": update_query})
+        modified_count = await repo.update_by_id(component_id, update_query)
 
-        if result.modified_count == 1:
+        if modified_count == 1:
             print(f"prompt component with id: {component_id} successfully updated!")
         else:
             print(f"No prompt component found with id: {component_id}")
@@ -279,24 +518,76 @@ async def update_prompt_component(user_req: update_prompt_component_request, aut
                 }
             )
 
-        return JSONResponse(status_code=200, content={
+        content = {
             "prompt_component_id": component_id,
             "status": "Success"
-        })
+        }
+
+        if BACKGROUND_EVALUATION:
+            content["evaluation_job_id"] = await enqueue_evaluation(component_id, prompt_component, "prompt_component", "accuracy")
+
+        return JSONResponse(status_code=200, content=content)
     
     except Exception as e:
         print(f"Error: {e}")
         return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error: {e}")
     
 
+# === evaluation cache stats endpoint === #
+@library.get("/prompts/evaluation-cache/stats")
+async def get_evaluation_cache_stats(auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to get hit/miss counters of the prompt evaluation cache """
+    return get_cache_stats()
+
+
+# === library cache stats endpoint === #
+@library.get("/prompts/library-cache/stats")
+async def get_library_cache_stats(auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to get hit/miss counters of the library read cache (this worker) """
+    return library_cache.stats
+
+
+# === evaluation job status endpoint === #
+@library.get("/prompts/evaluation-jobs/{job_id}")
+async def get_evaluation_status(job_id: str, auth: str = Depends(verify_basic_auth)):
+    """ Endpoint to poll the status of a background prompt evaluation """
+    try:
+        if not ObjectId.is_valid(job_id):
+            return JSONResponse(status_code=422, content="Invalid job ID")
+
+        job = await get_evaluation_job(job_id)
+
+        if not job:
+            return JSONResponse(status_code=404, content={
+                "evaluation_job_id": job_id,
+                "status": "Failed",
+                "content": f"No evaluation job found with id: {job_id}"
+            })
+
+        return {
+            "evaluation_job_id": job_id,
+            "prompt_id": str(job.get("doc_id")),
+            "status": job.get("status"),
+            "accuracy": job.get("accuracy"),
+            "attempts": job.get("attempts"),
+            "error": job.get("error"),
+            "created_at": job.get("created_at").isoformat(),
+            "updated_at": job.get("updated_at").isoformat()
+        }
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        return HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Internal Server Error: {e}")
+
+
 # === deletion endpoint === #
 @library.delete("/prompts/delete-prompt/{prompt_id}")
-async def delete_prompt_component(prompt_id: str, auth: str = Depends(verify_basic_auth)):
+async def delete_prompt_component(prompt_id: str, repo: PromptRepository = Depends(get_prompt_repo), auth: str = Depends(verify_basic_auth)):
     """ Endpont to delete prompt or prompt component """
     try:
-        result = prompt_library.delete_one({"_id": ObjectId(prompt_id)})
+        deleted_count = await repo.delete_by_id(prompt_id)
 
-        if result.deleted_count == 0:
+        if deleted_count == 0:
             print(f"No prompt or prompt found with id: {prompt_id}")
             return JSONResponse(status_code=404, content={
                 "prompt_id": prompt_id,
@@ -0,0 +1,113 @@
+""" Load test: /available-actions latency while /build-tool LLM calls are in flight.
+
+Fires --builds concurrent /build-tool requests and, while they are outstanding,
+probes /available-actions every --probe-interval seconds. Probe latency should stay
+at its idle baseline; a blocking LLM call shows up as probe latency of seconds.
+
+Against a running server (real LLM):
+    USRNAME=... PASSWORD=... python -m benchmarks.build_tool_load --url http://localhost:4652 --builds 20
+
+In process, with the fake LLM provider at a fixed latency (no API key needed):
+    USRNAME=... PASSWORD=... python -m benchmarks.build_tool_load --in-process --llm-latency 3 --builds 20
+"""
+import os
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ACTIONS_PREFIX = "/prompt/actions"
+BUILD_PROMPT = "write a function that converts a date string to IST"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def report(name, latencies):
+    print(
+        f"{name:<22} n={len(latencies)} p50={statistics.median(latencies):.2f}ms "
+        f"p99={percentile(latencies, 99):.2f}ms max={max(latencies):.2f}ms"
+    )
+
+
+def in_process_client(llm_latency: float):
+    # the fake provider stands in for the model; must be configured before code_helper is imported
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY"] = f"fixed:{llm_latency}"
+    os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+
+    from fastapi import FastAPI
+
+    from Routers.action_assistant import actions
+
+    app = FastAPI()
+    app.include_router(actions)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+async def probe(client, count, interval):
+    latencies = []
+
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get(f"{ACTIONS_PREFIX}/available-actions")
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(interval)
+
+    return latencies
+
+
+async def build(client, i):
+    start = time.perf_counter()
+    # distinct prompts so the tool response cache never answers
+    response = await client.post(f"{ACTIONS_PREFIX}/build-tool", json={"user_prompt": f"{BUILD_PROMPT} #{i}", "uu_id": None})
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+async def main(args):
+    auth = (os.getenv("USRNAME"), os.getenv("PASSWORD"))
+
+    if args.in_process:
+        client = in_process_client(args.llm_latency)
+    else:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+
+    client.auth = auth
+
+    async with client:
+        report("idle probe", await probe(client, args.probes, args.probe_interval))
+
+        builds = [asyncio.create_task(build(client, i)) for i in range(args.builds)]
+        # give the builds a moment to reach the LLM before probing
+        await asyncio.sleep(args.probe_interval)
+
+        probe_latencies = await probe(client, args.probes, args.probe_interval)
+        in_flight = sum(1 for task in builds if not task.done())
+        build_latencies = await asyncio.gather(*builds)
+
+        report("probe during builds", probe_latencies)
+        report("build-tool", build_latencies)
+        print(f"build-tool calls still in flight when probing finished: {in_flight}/{args.builds}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:4652")
+    parser.add_argument("--in-process", action="store_true")
+    parser.add_argument("--llm-latency", type=float, default=3.0)
+    parser.add_argument("--builds", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+""" Check that tools generated by parse_curl (/tool-from-curl) pass /smoke-test end to end:
+accepted by the validator, executed in the sandbox and sending the request the cURL describes.
+
+Usage:
+    SANDBOX_USER=nobody python -m benchmarks.check_curl_smoke_test    (SANDBOX_USER only when running as root)
+"""
+import sys
+import json
+import asyncio
+
+from utils.curl_parser import parse_curl
+from utils.tool_sandbox import smoke_test
+
+CASES = [
+    (
+        "curl -X POST 'https://api.example.com/v1/orders?source=voice' -H 'Content-Type: application/json' -H 'Authorization: Bearer token' -d '{\"order_id\": \"123\", \"customer\": {\"city\": \"Pune\"}}'",
+        {"json": {"order_id": "order_id", "customer.city": "city"}},
+        {"order_id": "987", "city": "Delhi"}
+    ),
+    (
+        "curl 'https://api.example.com/v1/tickets?status=open&page=1' -H 'token: abc'",
+        {"params": {"page": "page"}, "headers": {"token": "auth_token"}},
+        {"page": "2", "auth_token": "secret-value"}
+    ),
+    (
+        "curl -X PUT https://api.example.com/v1/notes/7 -d 'note=call back'",
+        None,
+        {}
+    )
+]
+
+
+async def main():
+    failed = False
+
+    for curl_command, dynamic_map, args in CASES:
+        code = parse_curl(curl_command, dynamic_map)
+        report = await smoke_test(code, args, curl_command, dynamic_map)
+        ok = report["status"] == "ok" and report.get("matches_curl", False)
+        failed = failed or not ok
+
+        print(f"{'OK  ' if ok else 'FAIL'} {curl_command[:60]}")
+
+        if not ok:
+            details = {key: report.get(key) for key in ("status", "error", "validation_errors", "curl_mismatches", "output")}
+            print(json.dumps(details, indent=2))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+""" Check that /prompts filters are served by an index scan, not a collection scan.
+
+Usage:
+    DB_URI=mongodb://localhost:27017 python -m benchmarks.check_prompt_query_plan
+"""
+import sys
+import json
+import asyncio
+
+from utils.prompt_repository import prompt_repo, prompts_query
+
+
+def plan_stages(plan):
+    """ yield every stage name of a (nested) winning plan """
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_stages(value)
+
+
+async def main():
+    await prompt_repo.ensure_indexes()
+    await prompt_repo.migrate_shadow_fields()
+
+    queries = [
+        prompts_query("Banking"),
+        prompts_query("Banking", "English"),
+        prompts_query("bank", prefix=True),
+        prompts_query("bank", "eng", prefix=True),
+    ]
+
+    failed = False
+
+    for query in queries:
+        explain = await prompt_repo.collection.find(query).explain()
+        stages = set(plan_stages(explain["queryPlanner"]["winningPlan"]))
+        ok = "IXSCAN" in stages and "COLLSCAN" not in stages
+        failed = failed or not ok
+
+        print(f"{'OK  ' if ok else 'FAIL'} {json.dumps(query)} -> {sorted(stages)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
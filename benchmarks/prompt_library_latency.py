@@ -0,0 +1,114 @@
+""" Benchmark: p50/p99 latency of concurrent mixed read/write prompt library traffic.
+
+Compares the old data path (sync pymongo calls made inline inside coroutines,
+blocking the event loop) with the async PromptRepository.
+
+Usage:
+    DB_URI=mongodb://localhost:27017 python -m benchmarks.prompt_library_latency --requests 2000 --concurrency 50
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import statistics
+
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+from utils.mongo import MongoManager
+from utils.prompt_repository import PromptRepository
+
+load_dotenv()
+
+DB_URI = os.getenv("DB_URI")
+BENCH_COLLECTION = "prompt_library_benchmark"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def new_document(i):
+    return {
+        "service_type": random.choice(["Banking", "Insurance", "Healthcare", "Retail"]),
+        "prompt_accuracy": "90.0",
+        "prompt": f"benchmark prompt {i} " * 50,
+        "agent_type": "inbound",
+        "use_case": "Benchmark",
+        "language": random.choice(["English", "Hindi"]),
+        "component_type": "prompt"
+    }
+
+
+async def blocking_operation(collection, i, write_ratio):
+    """ old behaviour: sync driver call made directly inside the coroutine """
+    if random.random() < write_ratio:
+        collection.insert_one(new_document(i))
+    else:
+        list(collection.find({"component_type": "prompt", "service_type": "Banking"}))
+
+
+async def async_operation(repo, i, write_ratio):
+    if random.random() < write_ratio:
+        await repo.insert_one(new_document(i))
+    else:
+        await repo.find({"component_type": "prompt", "service_type": "Banking"})
+
+
+async def run_load(operation, target, total_requests, concurrency, write_ratio):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request(i):
+        # latency includes time spent waiting for the loop / a free slot
+        start = time.perf_counter()
+        async with semaphore:
+            await operation(target, i, write_ratio)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    return latencies, elapsed
+
+
+def report(name, latencies, elapsed):
+    print(
+        f"{name:<10} requests={len(latencies)} throughput={len(latencies) / elapsed:.1f} req/s "
+        f"p50={statistics.median(latencies):.2f}ms p99={percentile(latencies, 99):.2f}ms max={max(latencies):.2f}ms"
+    )
+
+
+async def main(args):
+    sync_collection = MongoClient(DB_URI)["vb_platform"][BENCH_COLLECTION]
+    manager = MongoManager(DB_URI, "vb_platform", maxPoolSize=args.concurrency)
+    repo = PromptRepository(BENCH_COLLECTION, manager=manager)
+
+    # seed so that reads return real documents
+    sync_collection.drop()
+    sync_collection.insert_many([new_document(i) for i in range(args.seed)])
+
+    try:
+        latencies, elapsed = await run_load(blocking_operation, sync_collection, args.requests, args.concurrency, args.write_ratio)
+        report("blocking", latencies, elapsed)
+
+        latencies, elapsed = await run_load(async_operation, repo, args.requests, args.concurrency, args.write_ratio)
+        report("async", latencies, elapsed)
+
+    finally:
+        sync_collection.drop()
+        await manager.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=5000)
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,57 @@
+""" Benchmark: top-k latency of the prompt similarity index.
+
+Usage:
+    python -m benchmarks.similarity_topk --prompts 100000 --queries 200
+"""
+import time
+import random
+import argparse
+import statistics
+
+import numpy as np
+
+from utils.vectors import HashingEmbedder, VectorIndex, PROMPT_EMBEDDING_DIM
+
+WORDS = "loan payment customer ticket order delivery refund booking insurance claim policy account balance appointment doctor".split()
+
+
+def random_prompt(length=60):
+    return " ".join(random.choice(WORDS) for _ in range(length))
+
+
+def main(args):
+    embedder = HashingEmbedder(args.dim)
+    index = VectorIndex(args.dim, capacity=args.prompts)
+    labels = ["Banking", "Insurance", "Healthcare", "Retail"]
+
+    start = time.perf_counter()
+    for i in range(args.prompts):
+        # random unit vectors stand in for real prompt bodies when filling the index
+        vector = np.random.standard_normal(args.dim).astype(np.float32)
+        index.upsert(str(i), vector / np.linalg.norm(vector), random.choice(labels))
+    print(f"filled {args.prompts} vectors ({index.vectors.nbytes / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+    for label in (None, "Banking"):
+        latencies = []
+
+        for _ in range(args.queries):
+            query = embedder.embed(random_prompt())
+            start = time.perf_counter()
+            index.top_k(query, args.top_k, label)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        latencies.sort()
+        print(
+            f"top_k={args.top_k} service_type={label}: "
+            f"p50={statistics.median(latencies):.2f}ms p99={latencies[int(len(latencies) * 0.99) - 1]:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompts", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=PROMPT_EMBEDDING_DIM)
+    parser.add_argument("--top-k", type=int, default=10)
+
+    main(parser.parse_args())
@@ -0,0 +1,87 @@
+""" Benchmark: worker boot time of main:app.
+
+import   -> time to `import main` in a fresh interpreter (what every gunicorn worker & --reload pays)
+eager    -> import plus building the tool-builder graph, i.e. the cost that used to be paid at import
+ready    -> spawn uvicorn and poll until /prompt/openapi.json answers (runs the lifespan, needs DB_URI)
+
+Usage:
+    python -m benchmarks.startup_time --runs 5
+    DB_URI=mongodb://localhost:27017 python -m benchmarks.startup_time --runs 3 --ready
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+EAGER_SNIPPET = """
+import time, asyncio
+start = time.perf_counter()
+import main
+from utils.code_helper import get_graph
+asyncio.run(get_graph())
+print(time.perf_counter() - start)
+"""
+
+
+def run_snippet(snippet: str, env: dict):
+    output = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, env=env, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def time_to_ready(port: int, env: dict, timeout: float = 60):
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/prompt/openapi.json", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+
+            time.sleep(0.02)
+
+        raise TimeoutError(f"server not ready within {timeout}s")
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def report(name, seconds):
+    print(f"{name:<8} runs={len(seconds)} median={statistics.median(seconds) * 1000:.0f}ms min={min(seconds) * 1000:.0f}ms max={max(seconds) * 1000:.0f}ms")
+
+
+def main(args):
+    # graph construction needs no live model or database for this measurement
+    env = {**os.environ, "LLM_PROVIDER": os.getenv("LLM_PROVIDER", "fake"), "CHECKPOINTER_BACKEND": os.getenv("CHECKPOINTER_BACKEND", "memory")}
+
+    report("import", [run_snippet(IMPORT_SNIPPET, env) for _ in range(args.runs)])
+    report("eager", [run_snippet(EAGER_SNIPPET, env) for _ in range(args.runs)])
+
+    if args.ready:
+        report("ready", [time_to_ready(args.port, env) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--ready", action="store_true")
+    parser.add_argument("--port", type=int, default=4799)
+
+    main(parser.parse_args())
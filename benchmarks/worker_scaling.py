@@ -0,0 +1,147 @@
+""" Benchmark: throughput of /action-template and /tool-from-curl as gunicorn workers are added.
+
+For each worker count, starts gunicorn with gunicorn.conf.py, drives it from --clients load
+generator processes (so the client is not the bottleneck) and reports req/s and the scaling
+efficiency against one worker: throughput(n) / (n * throughput(1)). Near 1.0 is linear.
+
+Serves this module's `app` (the actions router only) by default, so no MongoDB or LLM is needed;
+pass --app main:app to measure the full service (needs DB_URI, and REDIS_URL above one worker).
+
+Usage:
+    USRNAME=... PASSWORD=... python -m benchmarks.worker_scaling --workers 1 2 4 --requests 4000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ACTIONS_PREFIX = "/prompt/actions"
+CURL_REQUEST = {
+    "curl_command": "curl -X POST 'https://api.example.com/v1/orders?source=voice' -H 'Content-Type: application/json' -H 'Authorization: Bearer token' -d '{\"order_id\": \"123\", \"note\": \"call back\"}'",
+    "dynamic_map": "{\"json\": {\"order_id\": \"order_id\"}}"
+}
+ENDPOINTS = {
+    "action-template": ("GET", f"{ACTIONS_PREFIX}/action-template", {"params": {"action_name": "post_call", "external_api_call": True, "update_dashboard_code": True}}),
+    "tool-from-curl": ("POST", f"{ACTIONS_PREFIX}/tool-from-curl", {"json": CURL_REQUEST})
+}
+
+
+def create_app():
+    from fastapi import FastAPI
+
+    from Routers.action_assistant import actions
+
+    app = FastAPI()
+    app.include_router(actions)
+    return app
+
+
+if os.getenv("WORKER_SCALING_APP"):
+    app = create_app()
+
+
+def start_server(app_path: str, workers: int, port: int, timeout: float = 60):
+    env = {**os.environ, "WEB_WORKERS": str(workers), "BIND": f"127.0.0.1:{port}", "WORKER_SCALING_APP": "1"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", app_path, "-c", "gunicorn.conf.py"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < timeout:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise TimeoutError(f"gunicorn not ready within {timeout}s")
+
+
+async def drive(url: str, endpoint: str, requests: int, concurrency: int):
+    method, path, kwargs = ENDPOINTS[endpoint]
+    auth = (os.getenv("USRNAME"), os.getenv("PASSWORD"))
+    remaining = iter(range(requests))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, auth=auth, limits=limits, timeout=None) as client:
+        async def loop():
+            for _ in remaining:
+                response = await client.request(method, path, **kwargs)
+                response.raise_for_status()
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+
+
+def client_process(url: str, endpoint: str, requests: int, concurrency: int):
+    asyncio.run(drive(url, endpoint, requests, concurrency))
+
+
+def measure(url: str, endpoint: str, requests: int, clients: int, concurrency: int):
+    """ requests per second with `clients` load generator processes sharing the requests """
+    # warm up every worker's connection & code paths
+    client_process(url, endpoint, clients * concurrency * 4, concurrency)
+
+    processes = [
+        multiprocessing.Process(target=client_process, args=(url, endpoint, requests // clients, concurrency))
+        for _ in range(clients)
+    ]
+
+    start = time.perf_counter()
+
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    elapsed = time.perf_counter() - start
+
+    if any(process.exitcode for process in processes):
+        raise RuntimeError(f"{endpoint}: a load generator failed")
+
+    return (requests // clients) * clients / elapsed
+
+
+def main(args):
+    baseline = {}
+    print(f"available CPUs: {os.cpu_count()} (load generators use some of them too)")
+
+    for workers in args.workers:
+        server = start_server(args.app, workers, args.port)
+
+        try:
+            for endpoint in args.endpoints:
+                throughput = measure(f"http://127.0.0.1:{args.port}", endpoint, args.requests, args.clients, args.concurrency)
+                baseline.setdefault(endpoint, throughput / workers)
+                efficiency = throughput / (workers * baseline[endpoint])
+
+                print(f"{endpoint:<16} workers={workers:<3} throughput={throughput:.0f} req/s efficiency={efficiency:.2f}")
+
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default="benchmarks.worker_scaling:app")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=4798)
+
+    main(parser.parse_args())
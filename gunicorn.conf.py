@@ -1,4 +1,15 @@
-bind = f"0.0.0.0:4652"
-workers = 1
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:4652")
+
+# a number, or "auto" for one worker per available CPU (async workers, so no 2n+1).
+# More than one keeps caches in Redis (STATE_BACKEND, needs REDIS_URL)
+WEB_WORKERS = os.getenv("WEB_WORKERS", "1")
+cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+workers = cpus if WEB_WORKERS == "auto" else int(WEB_WORKERS)
+
 worker_class = "uvicorn.workers.UvicornWorker"
-timeout = 120
\ No newline at end of file
+timeout = 120
+
+# workers inherit it and pick shared state backends; the app is not preloaded so each worker opens its own Mongo client
+os.environ["WEB_WORKERS"] = str(workers)
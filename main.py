@@ -1,11 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from Routers.action_assistant import actions
 from Routers.prompt_library import library
+from Routers.health import health
+from utils.prompt_utils import close_evaluator_client
+from utils.evaluation_jobs import start_evaluation_workers, stop_evaluation_workers
+from utils.evaluation_cache import ensure_cache_index
+from utils.mongo import mongo
+from utils.prompt_repository import prompt_repo
+from utils.prompt_search import ensure_text_index
+from utils.code_helper import ASSISTANT_WARMUP, warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one client (and connection pool) per worker process, created after gunicorn forks
+    mongo.open()
+    app.state.mongo = mongo
+
+    await prompt_repo.ensure_indexes()
+    await prompt_repo.migrate_shadow_fields()
+    await ensure_text_index()
+    await ensure_cache_index()
+
+    # background prompt evaluation workers (PROMPT_EVALUATION_MODE=background)
+    await start_evaluation_workers()
+
+    # the tool-builder graph is otherwise built lazily on the first /build-tool call
+    warmup = asyncio.create_task(warm_up()) if ASSISTANT_WARMUP else None
+
+    yield
+
+    if warmup:
+        warmup.cancel()
+
+    await stop_evaluation_workers()
+
+    # release pooled evaluator connections
+    await close_evaluator_client()
+
+    await mongo.close()
+
 
 app = FastAPI(
         title="Prompt Gallery API",
+        lifespan=lifespan,
         redoc_url="/prompt/redoc",
         docs_url="/prompt/docs",
         openapi_url="/prompt/openapi.json",
@@ -13,6 +56,7 @@ app = FastAPI(
 
 app.include_router(actions)
 app.include_router(library)
+app.include_router(health)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,5 +64,6 @@ app.add_middleware(
     allow_credentials = True,
     allow_methods = ["*"],  # allow POST, GET, OPTIONS etc.
     allow_headers = ["*"],  # allow Authorization, Content-Type etc.
+    expose_headers = ["X-Next-Cursor", "X-Total-Count", "ETag"],  # pagination & cache headers for the gallery UI
 )
 
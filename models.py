@@ -10,6 +10,15 @@ class function_request(BaseModel):
 class function_response(BaseModel):
     function_code: str
 
+# Request model to smoke-test a generated tool against a local HTTP stub
+class smoke_test_request(BaseModel):
+    python_code: str = Field(description="generated code containing customFunction")
+    sample_args: dict = Field(default_factory=dict, description="keyword arguments for customFunction")
+    curl_command: str | None = Field(None, description="source cURL to compare the emitted request against")
+    dynamic_map: str | None = Field(None, description="dynamic_map used to generate the function from the cURL")
+    stub_response: dict | list | None = Field(None, description="JSON body the stub server answers with")
+    stub_status: int = Field(200, description="status code the stub server answers with")
+
 # Request model for tool generation from prompt
 class tool_request(BaseModel):
     user_prompt: str
@@ -20,6 +29,10 @@ class tool_response(BaseModel):
     result: str
     uu_id: str
 
+# Request model for batch tool generation
+class tool_batch_request(BaseModel):
+    user_prompts: List[str] = Field(description="requirements, one tool is generated for each")
+
 class params_desc(BaseModel):
     param: str = Field(description="parameter name")
     pram_type: str = Field(description="parameter data type")
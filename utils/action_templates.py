@@ -1,3 +1,8 @@
+import json
+import hashlib
+from itertools import product
+from types import MappingProxyType
+
 from utils.action_template_components import *
 
 # === function to get pre_call template === #
@@ -98,4 +103,49 @@ def get_tool_digits_to_words():
             "data_type": "str",
             "param_description": "number to convert in words"
         }]
-    }
\ No newline at end of file
+    }
+
+
+# === catalog of every template variant, built once at import === #
+# flags of the /action-template endpoint that change each action's template, in key order
+TEMPLATE_FLAGS = {
+    "pre_call": ("external_api_call", "current_date_code"),
+    "post_call": ("external_api_call", "update_dashboard_code", "upload_recording_code"),
+    "get_current_date_time_tool": (),
+    "convert_digit_to_words_tool": ()
+}
+
+TEMPLATE_BUILDERS = {
+    "pre_call": get_pre_call_template,
+    "post_call": get_post_call_template,
+    "get_current_date_time_tool": get_tool_current_date_time,
+    "convert_digit_to_words_tool": get_tool_digits_to_words
+}
+
+
+def serialize_template(template: dict):
+    """ (JSON bytes, strong ETag) of a template response """
+    body = json.dumps(template).encode("utf-8")
+    return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def build_template_catalog():
+    """ immutable {(action_name, flag values): (JSON bytes, ETag)} for every flag combination """
+    catalog = {}
+
+    for action_name, flags in TEMPLATE_FLAGS.items():
+        for values in product((False, True), repeat=len(flags)):
+            catalog[(action_name, values)] = serialize_template(TEMPLATE_BUILDERS[action_name](*values))
+
+    return MappingProxyType(catalog)
+
+
+template_catalog = build_template_catalog()
+
+
+def lookup_template(action_name: str, **flags):
+    """ pre-serialized template for the request flags (flags an action ignores are ignored); None for unknown actions """
+    if action_name not in TEMPLATE_FLAGS:
+        return None
+
+    return template_catalog[(action_name, tuple(bool(flags.get(flag)) for flag in TEMPLATE_FLAGS[action_name]))]
\ No newline at end of file
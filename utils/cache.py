@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+
+# worker processes serving the app (gunicorn.conf.py exports it to its workers)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", 1))
+# "memory": caches live in the worker process, "shared": caches in Redis so every worker / host sees the same
+# entries & invalidations. Conversations are in MongoDB either way (CHECKPOINTER_BACKEND)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "shared" if WEB_WORKERS > 1 else "memory")
+
+# "memory": per-process LRU, "redis": shared by every worker / host (needs REDIS_URL)
+LIBRARY_CACHE_BACKEND = os.getenv("LIBRARY_CACHE_BACKEND", "redis" if STATE_BACKEND == "shared" else "memory")
+LIBRARY_CACHE_TTL = int(os.getenv("LIBRARY_CACHE_TTL", 300))
+LIBRARY_CACHE_MAX_ENTRIES = int(os.getenv("LIBRARY_CACHE_MAX_ENTRIES", 512))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class MemoryCache:
+    """ in-process cache with TTL expiry & LRU eviction; values are stored as is """
+
+    def __init__(self, max_entries: int = LIBRARY_CACHE_MAX_ENTRIES, ttl: int = LIBRARY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        # counters (namespace versions) are kept apart so LRU eviction can never reset them
+        self.counters = {}
+
+    async def get(self, key: str):
+        entry = self.entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at and expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value, ttl: int = None):
+        ttl = self.ttl if ttl is None else ttl
+        self.entries[key] = (time.monotonic() + ttl if ttl else None, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self.entries.pop(key, None)
+
+    async def get_counter(self, key: str):
+        return self.counters.get(key, 0)
+
+    async def incr(self, key: str):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    async def close(self):
+        self.entries.clear()
+
+
+class RedisCache:
+    """ shared cache so every gunicorn worker (and host) sees the same entries & invalidations; values are stored as JSON """
+
+    def __init__(self, url: str = REDIS_URL, ttl: int = LIBRARY_CACHE_TTL):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("LIBRARY_CACHE_BACKEND=redis requires the 'redis' package")
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, key: str):
+        value = await self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value, ttl: int = None):
+        ttl = self.ttl if ttl is None else ttl
+        await self.client.set(key, json.dumps(value), ex=ttl or None)
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+    async def get_counter(self, key: str):
+        return int(await self.client.get(key) or 0)
+
+    async def incr(self, key: str):
+        return await self.client.incr(key)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def etag_matches(if_none_match: str, etag: str):
+    """ If-None-Match check with weak comparison (a proxy may have turned the tag into W/"...") and "*" """
+    tags = [tag.strip() for tag in (if_none_match or "").split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [tag.removeprefix("W/") for tag in tags]
+
+
+def create_cache_backend(backend: str = LIBRARY_CACHE_BACKEND, max_entries: int = LIBRARY_CACHE_MAX_ENTRIES, ttl: int = LIBRARY_CACHE_TTL):
+    if backend == "redis":
+        try:
+            return RedisCache(ttl=ttl)
+        except RuntimeError as e:
+            print(f"Warning: {e}; falling back to the in-process cache")
+
+    if WEB_WORKERS > 1:
+        print(f"Warning: in-process cache with {WEB_WORKERS} workers; each worker caches & invalidates on its own")
+
+    return MemoryCache(max_entries=max_entries, ttl=ttl)
+
+
+class ReadThroughCache:
+    """ caches serialized JSON responses by namespace + normalized params.
+    Invalidating a namespace bumps its version, so stale keys are never read again & age out by TTL """
+
+    def __init__(self, backend, prefix: str = "library"):
+        self.backend = backend
+        self.prefix = prefix
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def version(self, namespace: str):
+        return await self.backend.get_counter(f"{self.prefix}:version:{namespace}")
+
+    async def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            await self.backend.incr(f"{self.prefix}:version:{namespace}")
+            self.stats["invalidations"] += 1
+
+    async def get_or_load(self, namespace: str, params: dict, loader):
+        """ return {"body", "etag", "headers"} for the params, calling loader() -> (content, headers) on a miss """
+        normalized = json.dumps({key: value for key, value in params.items() if value is not None}, sort_keys=True, default=str)
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        key = f"{self.prefix}:{namespace}:v{await self.version(namespace)}:{digest}"
+
+        cached = await self.backend.get(key)
+
+        if cached is not None:
+            self.stats["hits"] += 1
+            return cached
+
+        self.stats["misses"] += 1
+        content, headers = await loader()
+
+        body = json.dumps(content, default=str)
+        entry = {
+            "body": body,
+            "etag": '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"',
+            "headers": headers or {}
+        }
+        await self.backend.set(key, entry)
+
+        return entry
+
+
+library_cache = ReadThroughCache(create_cache_backend())
+
+
+class SharedVersion:
+    """ write counter kept in the state backend. A per-worker index remembers the version it reflects;
+    a newer one means another worker (or host) changed the data, so the index must be rebuilt """
+
+    def __init__(self, name: str, backend=None):
+        self.key = f"version:{name}"
+        self.backend = backend or library_cache.backend
+
+    async def current(self):
+        return await self.backend.get_counter(self.key)
+
+    async def bump(self):
+        return await self.backend.incr(self.key)
@@ -0,0 +1,193 @@
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from bson.binary import Binary
+from langchain_core.messages import SystemMessage, HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple, WRITES_IDX_MAP, get_checkpoint_id, get_checkpoint_metadata
+from langgraph.checkpoint.memory import InMemorySaver
+
+from utils.mongo import mongo
+from utils.cache import WEB_WORKERS
+
+# "mongo": persistent & shared by all workers, "memory": per-process InMemorySaver (local testing only)
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "mongo")
+# idle conversations expire this long after their last turn
+CONVERSATION_TTL = int(os.getenv("CONVERSATION_TTL", 24 * 60 * 60))
+# deserialized checkpoints of recently active threads kept in worker memory
+CONVERSATION_HOT_THREADS = int(os.getenv("CONVERSATION_HOT_THREADS", 256))
+# safety net on messages stored per thread (leading system & summary messages are always kept on top).
+# History compaction (HISTORY_TOKEN_BUDGET) normally keeps threads far shorter; keep this well above it
+CONVERSATION_MAX_MESSAGES = int(os.getenv("CONVERSATION_MAX_MESSAGES", 200))
+
+
+def cap_messages(messages: list, max_messages: int):
+    """ keep the leading system messages (including the history summary) plus the most recent whole turns """
+    if not max_messages or len(messages) <= max_messages:
+        return messages
+
+    head = 0
+    while head < len(messages) and isinstance(messages[head], SystemMessage):
+        head += 1
+
+    tail = messages[max(head, len(messages) - max(1, max_messages - head)):]
+
+    # don't start in the middle of a turn
+    start = next((position for position, message in enumerate(tail) if isinstance(message, HumanMessage)), len(tail) - 1)
+    return messages[:head] + tail[start:]
+
+
+class MongoCheckpointSaver(BaseCheckpointSaver):
+    """ async checkpointer keeping only the latest checkpoint of each thread, one document per thread.
+    Documents expire through a TTL index on updated_at; hot threads are served from an LRU
+    after a cheap checkpoint_id check, so another worker's newer checkpoint is never shadowed """
+
+    def __init__(self, collection, ttl: int = CONVERSATION_TTL, hot_threads: int = CONVERSATION_HOT_THREADS, max_messages: int = CONVERSATION_MAX_MESSAGES):
+        super().__init__()
+        self.collection = collection
+        self.ttl = ttl
+        self.hot_threads = hot_threads
+        self.max_messages = max_messages
+        self.hot = OrderedDict()
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("thread_id", 1), ("checkpoint_ns", 1)], unique=True)
+        await self.collection.create_index("updated_at", expireAfterSeconds=self.ttl)
+
+    def remember(self, key: tuple, checkpoint_tuple: CheckpointTuple):
+        self.hot[key] = checkpoint_tuple
+        self.hot.move_to_end(key)
+
+        while len(self.hot) > self.hot_threads:
+            self.hot.popitem(last=False)
+
+    def load(self, doc: dict):
+        thread_id, checkpoint_ns = doc["thread_id"], doc["checkpoint_ns"]
+
+        def thread_config(checkpoint_id):
+            return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+        return CheckpointTuple(
+            config=thread_config(doc["checkpoint_id"]),
+            checkpoint=self.undump(doc["checkpoint"]),
+            metadata=self.undump(doc["metadata"]),
+            parent_config=thread_config(doc["parent_checkpoint_id"]) if doc.get("parent_checkpoint_id") else None,
+            pending_writes=[
+                (write["task_id"], write["channel"], self.undump(write))
+                for write in doc.get("writes", [])
+            ]
+        )
+
+    def dump(self, value):
+        value_type, value = self.serde.dumps_typed(value)
+        return {"type": value_type, "value": Binary(value)}
+
+    def undump(self, stored: dict):
+        return self.serde.loads_typed((stored["type"], bytes(stored["value"])))
+
+    async def aget_tuple(self, config: dict):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        key = (thread_id, checkpoint_ns)
+
+        current = await self.collection.find_one({"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}, {"checkpoint_id": 1})
+
+        # only the latest checkpoint is stored
+        if current is None or get_checkpoint_id(config) not in (None, current["checkpoint_id"]):
+            self.hot.pop(key, None)
+            return None
+
+        cached = self.hot.get(key)
+
+        if cached and cached.config["configurable"]["checkpoint_id"] == current["checkpoint_id"]:
+            self.hot.move_to_end(key)
+            return cached
+
+        doc = await self.collection.find_one({"_id": current["_id"]})
+
+        if doc is None:
+            return None
+
+        checkpoint_tuple = self.load(doc)
+        self.remember(key, checkpoint_tuple)
+
+        return checkpoint_tuple
+
+    async def alist(self, config: dict, *, filter: dict = None, before: dict = None, limit: int = None):
+        if config is None or before is not None:
+            return
+
+        checkpoint_tuple = await self.aget_tuple(config)
+
+        if checkpoint_tuple and all(checkpoint_tuple.metadata.get(field) == value for field, value in (filter or {}).items()):
+            yield checkpoint_tuple
+
+    async def aput(self, config: dict, checkpoint: dict, metadata: dict, new_versions: dict):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        channel_values = checkpoint["channel_values"]
+
+        if isinstance(channel_values.get("messages"), list):
+            channel_values = {**channel_values, "messages": cap_messages(channel_values["messages"], self.max_messages)}
+            checkpoint = {**checkpoint, "channel_values": channel_values}
+
+        metadata = get_checkpoint_metadata(config, metadata)
+        parent_checkpoint_id = config["configurable"].get("checkpoint_id")
+
+        await self.collection.update_one(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns},
+            {"$set": {
+                "checkpoint_id": checkpoint["id"],
+                "parent_checkpoint_id": parent_checkpoint_id,
+                "checkpoint": self.dump(checkpoint),
+                "metadata": self.dump(metadata),
+                "writes": [],
+                "updated_at": datetime.now(timezone.utc)
+            }},
+            upsert=True
+        )
+
+        next_config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint["id"]}}
+        parent_config = {"configurable": {**next_config["configurable"], "checkpoint_id": parent_checkpoint_id}} if parent_checkpoint_id else None
+        self.remember((thread_id, checkpoint_ns), CheckpointTuple(next_config, checkpoint, metadata, parent_config, []))
+
+        return next_config
+
+    async def aput_writes(self, config: dict, writes, task_id: str, task_path: str = ""):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        documents = [
+            {"task_id": task_id, "task_path": task_path, "channel": channel, "idx": WRITES_IDX_MAP.get(channel, idx), **self.dump(value)}
+            for idx, (channel, value) in enumerate(writes)
+        ]
+
+        await self.collection.update_one(
+            {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": config["configurable"]["checkpoint_id"]},
+            {"$push": {"writes": {"$each": documents}}}
+        )
+
+        # the cached tuple no longer carries every pending write; the next checkpoint re-caches the thread
+        self.hot.pop((thread_id, checkpoint_ns), None)
+
+    async def adelete_thread(self, thread_id: str):
+        await self.collection.delete_many({"thread_id": thread_id})
+
+        for key in [key for key in self.hot if key[0] == thread_id]:
+            del self.hot[key]
+
+
+def create_checkpointer(backend: str = CHECKPOINTER_BACKEND):
+    if backend == "memory":
+        if WEB_WORKERS > 1:
+            print(f"Warning: CHECKPOINTER_BACKEND=memory with {WEB_WORKERS} workers; a follow-up turn only finds its conversation on the worker that served the first")
+
+        return InMemorySaver()
+
+    return MongoCheckpointSaver(mongo.collection("assistant_checkpoints"))
+
+
+async def ensure_checkpointer_indexes(checkpointer):
+    if isinstance(checkpointer, MongoCheckpointSaver):
+        await checkpointer.ensure_indexes()
@@ -1,40 +1,158 @@
+import os
 import json
+import asyncio
 from dotenv import load_dotenv
-from typing_extensions import TypedDict
-from typing import List, Annotated
 from uuid import uuid4
 
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import InMemorySaver
-from langchain_core.messages import SystemMessage, HumanMessage
-
 from models import *
+from utils.code_validation import validate_function, repair_prompt, validation_stats
 
 load_dotenv()
 
-class State(TypedDict):
-    messages: Annotated[List, add_messages]
+# max outstanding LLM requests per worker; extra /build-tool calls wait here instead of piling onto the API
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+# build the graph in the background right after startup instead of on the first /build-tool call
+ASSISTANT_WARMUP = os.getenv("ASSISTANT_WARMUP", "false").lower() == "true"
+
+# langchain / langgraph / the LLM client are heavy to import and need credentials,
+# so the model and graph are only built on first use (see get_llm / get_graph)
+llm = None
+graph = None
+graph_lock = asyncio.Lock()
+
+def get_llm():
+    """ structured-output model (LLM_PROVIDER: openai, fake, record or replay) """
+    global llm
+
+    if llm is None:
+        from utils.llm_provider import create_llm
+        llm = create_llm()
+
+    return llm
+
+async def generate(messages: list):
+    async with llm_semaphore:
+        return await get_llm().ainvoke(messages)
+
+async def chatmodel(state: dict):
+    from langgraph.config import get_stream_writer
+    from langchain_core.messages import HumanMessage, AIMessage
+    from utils.tool_cache import tool_cache, cacheable_request
+
+    # first-turn requests are answered from the response cache when possible
+    request = cacheable_request(state["messages"])
+
+    if request:
+        cached = await tool_cache.lookup(request)
+
+        if cached is not None:
+            return {"messages": AIMessage(content=json.dumps(cached))}
+
+    result = await generate(state["messages"])
+    errors = validate_function(result.python_function)
+    validation_stats["checked"] += 1
+
+    # re-prompt once with the rule violations
+    if errors:
+        validation_stats["failed"] += 1
+        get_stream_writer()({"retry": errors})
+
+        result = await generate(state["messages"] + [
+            AIMessage(content=json.dumps(result.model_dump())),
+            HumanMessage(content=repair_prompt(errors))
+        ])
+        errors = validate_function(result.python_function)
+        validation_stats["still_invalid" if errors else "repaired"] += 1
+
+    output = result.model_dump()
+
+    if errors:
+        output["validation_errors"] = errors
+
+    elif request:
+        await tool_cache.store(request, output)
+
+    return  {"messages": AIMessage(content=json.dumps(output))}   
+
+def compile_graph(checkpointer):
+    from typing import List, Annotated
+    from typing_extensions import TypedDict
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
+    from utils.history_compaction import compact_history
+
+    class State(TypedDict):
+        messages: Annotated[List, add_messages]
+
+    graph_builder = StateGraph(State)
+
+    graph_builder.add_node("compact_history", compact_history)
+    graph_builder.add_node("chatmodel", chatmodel)
+
+    graph_builder.add_edge(START, "compact_history")
+    graph_builder.add_edge("compact_history", "chatmodel")
+    graph_builder.add_edge("chatmodel", END)
+
+    return graph_builder.compile(checkpointer=checkpointer)
+
+async def get_graph():
+    """ compiled tool-builder graph, built once per worker on first use """
+    global graph
+
+    if graph is None:
+        async with graph_lock:
+            if graph is None:
+                from utils.checkpointer import create_checkpointer, ensure_checkpointer_indexes
+
+                # conversation state per uu_id (CHECKPOINTER_BACKEND, mongo by default)
+                checkpointer = await asyncio.to_thread(create_checkpointer)
+                await ensure_checkpointer_indexes(checkpointer)
+
+                # importing & compiling takes a while, keep it off the event loop
+                graph = await asyncio.to_thread(compile_graph, checkpointer)
+
+    return graph
+
+async def warm_up():
+    try:
+        await get_graph()
+    except Exception as e:
+        print(f"\nAssistant warm up failed, the graph will be built on first use; Error: {e}")
+
+
+def message_delta(message):
+    """ text added by one streamed LLM chunk: content tokens (json schema output) or tool call argument fragments """
+    delta = message.content if isinstance(message.content, str) else ""
+
+    for tool_call in message.tool_call_chunks:
+        delta += tool_call.get("args") or ""
+
+    return delta
 
-checkpointer = InMemorySaver()
 
-llm = ChatOpenAI(model="gpt-5.1-2025-11-13", temperature=0)
-llm = llm.with_structured_output(return_funcion)
+async def stream_function(inputs: dict, config: dict):
+    """ run the graph, yielding ("delta", partial output) as the LLM generates, ("retry", errors) when the
+    generated code failed validation and is regenerated, and ("result", return_funcion json) at the end """
+    from langchain_core.messages import AIMessageChunk
 
-def chatmodel(state: State):
-    result = llm.invoke(state["messages"])
+    graph = await get_graph()
 
-    return  {"messages": json.dumps(result.model_dump())}   
+    async for mode, chunk in graph.astream(inputs, config=config, stream_mode=["messages", "updates", "custom"]):
+        if mode == "custom":
+            yield "retry", chunk["retry"]
 
-graph_builder = StateGraph(State)
+        elif mode == "messages":
+            message, metadata = chunk
 
-graph_builder.add_node("chatmodel", chatmodel)
+            if isinstance(message, AIMessageChunk):
+                delta = message_delta(message)
 
-graph_builder.add_edge(START, "chatmodel")
-graph_builder.add_edge("chatmodel", END)
+                if delta:
+                    yield "delta", delta
 
-graph = graph_builder.compile(checkpointer=checkpointer)
+        elif "chatmodel" in chunk:
+            yield "result", chunk["chatmodel"]["messages"].content
 
 
 system_message = """You are Professional Code assistant. Use the user's natural-language requirement and write an simple single Python function.
@@ -63,7 +181,9 @@ Your task: Based on the user's requirement, generate a single customFunction fol
 
 
 if __name__ == "__main__":
+    from langchain_core.messages import SystemMessage, HumanMessage
 
+    graph = asyncio.run(get_graph())
     is_first = True
 
     while True:
@@ -80,9 +200,9 @@ if __name__ == "__main__":
             break
 
         if not is_first:
-            result = graph.invoke({"messages": [HumanMessage(content=user)]}, config=config)
+            result = asyncio.run(graph.ainvoke({"messages": [HumanMessage(content=user)]}, config=config))
             print(f"\nAgent: {result['messages'][-1].content}")
         else:
-            result = graph.invoke({"messages": [SystemMessage(content=system_message), HumanMessage(content=user)]}, config=config)
+            result = asyncio.run(graph.ainvoke({"messages": [SystemMessage(content=system_message), HumanMessage(content=user)]}, config=config))
             is_first = False
             print(f"\nAgent: {result['messages'][-1].content}")
\ No newline at end of file
@@ -0,0 +1,112 @@
+import os
+import re
+import ast
+
+# top-level modules generated functions may import
+TOOL_ALLOWED_IMPORTS = set(os.getenv(
+    "TOOL_ALLOWED_IMPORTS",
+    "os,json,re,math,time,datetime,zoneinfo,calendar,decimal,random,string,uuid,typing,difflib,base64,hashlib,"
+    "collections,urllib,traceback,requests,httpx,pytz,dateutil,pymongo,bson"
+).split(","))
+
+# parameter names that would pass credentials or connection config (rule 6 of the system message)
+CREDENTIAL_WORDS = {"uri", "url", "host", "hostname", "port", "dsn", "db", "database", "config", "auth", "pwd", "password", "passwd", "secret", "token", "credential", "credentials"}
+CREDENTIAL_PHRASES = ("apikey", "accesskey", "secretkey", "authkey", "connectionstring", "baseurl", "endpoint")
+NAME_PARTS = re.compile(r"[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])")
+
+# builtins that import or run code the import allowlist never sees
+DYNAMIC_CODE_NAMES = {"__import__", "__builtins__", "eval", "exec", "compile", "globals", "locals", "vars", "breakpoint"}
+
+validation_stats = {
+    "checked": 0,
+    "failed": 0,
+    "repaired": 0,
+    "still_invalid": 0
+}
+
+
+def is_credential_name(name: str):
+    parts = [part.lower() for part in NAME_PARTS.findall(name)]
+    joined = "".join(parts)
+
+    return any(part in CREDENTIAL_WORDS for part in parts) or any(phrase in joined for phrase in CREDENTIAL_PHRASES)
+
+
+def check_imports(node, errors: list):
+    for child in ast.walk(node):
+        if isinstance(child, ast.Import):
+            modules = [alias.name for alias in child.names]
+        elif isinstance(child, ast.ImportFrom):
+            modules = [child.module or ""] if not child.level else ["." * child.level]
+        else:
+            continue
+
+        for module in modules:
+            if module.split(".")[0] not in TOOL_ALLOWED_IMPORTS:
+                errors.append(f"line {child.lineno}: import of '{module}' is not allowed")
+
+
+def check_dynamic_code(node, errors: list):
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in DYNAMIC_CODE_NAMES:
+            errors.append(f"line {child.lineno}: '{child.id}' is not allowed")
+
+        elif isinstance(child, ast.Attribute) and child.attr.startswith("__") and child.attr.endswith("__"):
+            errors.append(f"line {child.lineno}: dunder attribute '{child.attr}' is not allowed")
+
+
+def validate_function(code: str, check_credentials: bool = True):
+    """ rule violations in generated code; an empty list means the code is acceptable.
+    check_credentials=False skips the parameter naming rule (e.g. for code built by parse_curl) """
+    try:
+        tree = ast.parse(code or "")
+    except SyntaxError as e:
+        return [f"line {e.lineno}: syntax error: {e.msg}"]
+
+    errors = []
+    functions = []
+
+    for node in tree.body:
+        # imports and a stray docstring are harmless at module level
+        if isinstance(node, (ast.Import, ast.ImportFrom)) or (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)):
+            continue
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node)
+
+            if node.name != "customFunction":
+                errors.append(f"line {node.lineno}: extra function '{node.name}'; all logic must be inside customFunction")
+            continue
+
+        if isinstance(node, ast.ClassDef):
+            errors.append(f"line {node.lineno}: class '{node.name}' is not allowed")
+        else:
+            errors.append(f"line {node.lineno}: top-level statement outside customFunction")
+
+    if not any(function.name == "customFunction" for function in functions):
+        errors.append("no function named customFunction")
+
+    elif sum(1 for function in functions if function.name == "customFunction") > 1:
+        errors.append("customFunction is defined more than once")
+
+    check_imports(tree, errors)
+    check_dynamic_code(tree, errors)
+
+    for function in functions:
+        if function.name != "customFunction" or not check_credentials:
+            continue
+
+        arguments = function.args
+        for argument in arguments.posonlyargs + arguments.args + arguments.kwonlyargs:
+            if is_credential_name(argument.arg):
+                errors.append(f"parameter '{argument.arg}' looks like a credential or connection setting; define it inside the function body")
+
+    return errors
+
+
+def repair_prompt(errors: list):
+    return (
+        "The customFunction you generated breaks the rules:\n"
+        + "\n".join(f"- {error}" for error in errors)
+        + "\nReturn the corrected function, following every rule."
+    )
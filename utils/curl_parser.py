@@ -77,30 +77,8 @@ def generate_simple_dict(dict_name: str, data: dict, dynamic_keys: dict) -> str:
     return "\n".join(lines)
 
 
-def parse_curl(curl_command: str, dynamic_map: Optional[Dict[str, Dict[str, str]]] = None) -> str:
-    """
-    Generate python code for api from provided cURL
-
-    Args:
-        curl_command (str): entire curl as string format 
-
-    Returns:
-        str: python code for given api curl
-
-    dynamic_map structure example:
-    {
-        "headers": {
-            "token": "auth_token"                    # Simple key match
-        }
-        "json": {
-            "ticketID": "ticket_id"                  # Simple key match
-            "user.address.city": "city_var",         # Dot notation for nested
-        }
-    }
-    """
-
-    if dynamic_map is None:
-        dynamic_map = {"params": {}, "headers": {}, "json": {}}
+def parse_curl_request(curl_command: str) -> dict:
+    """Parse a cURL command into method, url, headers, params & payload (dict, or {"raw_data": ...} for non JSON data)"""
 
     # === Parse cURL === #
     try:
@@ -154,6 +132,47 @@ def parse_curl(curl_command: str, dynamic_map: Optional[Dict[str, Dict[str, str]
         except:
             payload_data = {"raw_data": data_str}
 
+    return {
+        "method": method,
+        "url": url,
+        "headers": headers,
+        "params": params,
+        "payload": payload_data
+    }
+
+
+def parse_curl(curl_command: str, dynamic_map: Optional[Dict[str, Dict[str, str]]] = None) -> str:
+    """
+    Generate python code for api from provided cURL
+
+    Args:
+        curl_command (str): entire curl as string format 
+
+    Returns:
+        str: python code for given api curl
+
+    dynamic_map structure example:
+    {
+        "headers": {
+            "token": "auth_token"                    # Simple key match
+        }
+        "json": {
+            "ticketID": "ticket_id"                  # Simple key match
+            "user.address.city": "city_var",         # Dot notation for nested
+        }
+    }
+    """
+
+    if dynamic_map is None:
+        dynamic_map = {"params": {}, "headers": {}, "json": {}}
+
+    request = parse_curl_request(curl_command)
+    method = request["method"]
+    url = request["url"]
+    headers = request["headers"]
+    params = request["params"]
+    payload_data = request["payload"]
+
     # === Build Function Signature === #
     args_list = []
     all_dynamic_vars = set()
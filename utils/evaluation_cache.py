@@ -0,0 +1,122 @@
+import os
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from utils.mongo import mongo
+from utils.prompt_utils import evaluate_prompt
+
+EVALUATION_CACHE_TTL = int(os.getenv("PROMPT_EVALUATION_CACHE_TTL", 30 * 24 * 60 * 60))
+EVALUATION_CACHE_SIZE = int(os.getenv("PROMPT_EVALUATION_CACHE_SIZE", 2048))
+
+# persistent cache shared by all workers; documents expire through a TTL index on created_at
+EVALUATION_CACHE_COLLECTION = "prompt_evaluation_cache"
+
+# in-process LRU in front of the persistent cache
+local_cache = OrderedDict()
+
+# evaluations currently running, so identical concurrent submissions share one evaluator call
+in_flight = {}
+
+cache_stats = {
+    "local_hits": 0,
+    "db_hits": 0,
+    "coalesced": 0,
+    "misses": 0
+}
+
+
+def cache_collection():
+    return mongo.collection(EVALUATION_CACHE_COLLECTION)
+
+
+def prompt_hash(text: str):
+    """ hash of the prompt text with whitespace normalized """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def is_parsed(accuracy):
+    """ get_accuracy returns the matched percentage as a string, or 0 when the evaluator output had none """
+    return isinstance(accuracy, str)
+
+
+def remember(key: str, accuracy):
+    local_cache[key] = accuracy
+    local_cache.move_to_end(key)
+
+    if len(local_cache) > EVALUATION_CACHE_SIZE:
+        local_cache.popitem(last=False)
+
+
+async def ensure_cache_index():
+    await cache_collection().create_index("created_at", expireAfterSeconds=EVALUATION_CACHE_TTL)
+
+
+async def lookup(key: str):
+    if key in local_cache:
+        local_cache.move_to_end(key)
+        cache_stats["local_hits"] += 1
+        return local_cache[key]
+
+    cached = await cache_collection().find_one({"_id": key})
+
+    # entries without a parsed accuracy (cached before they were skipped) are evaluated again
+    if cached and is_parsed(cached.get("accuracy")):
+        cache_stats["db_hits"] += 1
+        remember(key, cached.get("accuracy"))
+        return cached.get("accuracy")
+
+    return None
+
+
+async def evaluate_and_store(key: str, prompt: str):
+    evaluation = await evaluate_prompt(prompt)
+    accuracy = evaluation.get("accuracy")
+
+    if not is_parsed(accuracy):
+        # a transient evaluator failure must not stick for EVALUATION_CACHE_TTL; the next submission asks again
+        return accuracy
+
+    await cache_collection().update_one(
+        {"_id": key},
+        {"$set": {"accuracy": accuracy, "created_at": datetime.now(timezone.utc)}},
+        upsert=True
+    )
+    remember(key, accuracy)
+
+    return accuracy
+
+
+async def evaluate_prompt_cached(prompt: str):
+    """ evaluate_prompt with results cached by prompt content hash """
+    key = prompt_hash(prompt)
+
+    accuracy = await lookup(key)
+
+    if accuracy is None:
+        if key in in_flight:
+            cache_stats["coalesced"] += 1
+        else:
+            cache_stats["misses"] += 1
+            in_flight[key] = asyncio.ensure_future(evaluate_and_store(key, prompt))
+            in_flight[key].add_done_callback(lambda _: in_flight.pop(key, None))
+
+        accuracy = await asyncio.shield(in_flight[key])
+
+    return {
+        "prompt": prompt,
+        "accuracy": accuracy
+    }
+
+
+def get_cache_stats():
+    hits = cache_stats["local_hits"] + cache_stats["db_hits"] + cache_stats["coalesced"]
+    total = hits + cache_stats["misses"]
+
+    return {
+        **cache_stats,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+        "local_size": len(local_cache)
+    }
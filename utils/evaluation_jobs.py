@@ -0,0 +1,165 @@
+import os
+import asyncio
+import traceback
+from datetime import datetime, timezone, timedelta
+
+from pymongo import ReturnDocument
+from bson.objectid import ObjectId
+
+from utils.mongo import mongo
+from utils.prompt_repository import prompt_repo
+from utils.evaluation_cache import evaluate_prompt_cached
+
+# "sync": evaluate before writing (default), "background": write first, evaluate in worker pool
+PROMPT_EVALUATION_MODE = os.getenv("PROMPT_EVALUATION_MODE", "sync")
+BACKGROUND_EVALUATION = PROMPT_EVALUATION_MODE == "background"
+
+EVALUATION_WORKERS = int(os.getenv("PROMPT_EVALUATION_WORKERS", 4))
+EVALUATION_MAX_ATTEMPTS = int(os.getenv("PROMPT_EVALUATION_MAX_ATTEMPTS", 3))
+EVALUATION_POLL_INTERVAL = float(os.getenv("PROMPT_EVALUATION_POLL_INTERVAL", 5))
+EVALUATION_STALE_AFTER = float(os.getenv("PROMPT_EVALUATION_STALE_AFTER", 600))
+
+PENDING_ACCURACY = "pending"
+FAILED_ACCURACY = "failed"
+
+EVALUATION_JOBS_COLLECTION = "prompt_evaluation_jobs"
+
+# wakes idle workers as soon as a job is queued from this process
+job_available = asyncio.Event()
+worker_tasks = []
+
+
+def jobs_collection():
+    return mongo.collection(EVALUATION_JOBS_COLLECTION)
+
+
+def now():
+    return datetime.now(timezone.utc)
+
+
+def new_job(doc_id, text: str, text_field: str, accuracy_field: str):
+    return {
+        "doc_id": ObjectId(doc_id),
+        "text": text,
+        "text_field": text_field,
+        "accuracy_field": accuracy_field,
+        "status": "queued",
+        "attempts": 0,
+        "error": None,
+        "created_at": now(),
+        "updated_at": now()
+    }
+
+
+async def enqueue_evaluation(doc_id, text: str, text_field: str, accuracy_field: str):
+    """ queue an accuracy evaluation for a library document; returns job id """
+    result = await jobs_collection().insert_one(new_job(doc_id, text, text_field, accuracy_field))
+    job_available.set()
+
+    return str(result.inserted_id)
+
+
+async def enqueue_evaluations(items: list):
+    """ queue evaluations for (doc_id, text, text_field, accuracy_field) tuples in one write; returns job ids """
+    result = await jobs_collection().insert_many([new_job(*item) for item in items])
+    job_available.set()
+
+    return [str(job_id) for job_id in result.inserted_ids]
+
+
+async def get_evaluation_job(job_id: str):
+    return await jobs_collection().find_one({"_id": ObjectId(job_id)})
+
+
+async def claim_job():
+    """ atomically move the oldest queued job to running; a job left running past EVALUATION_STALE_AFTER
+    (its worker crashed or was stopped mid-run) is claimed again """
+    stale_before = now() - timedelta(seconds=EVALUATION_STALE_AFTER)
+
+    return await jobs_collection().find_one_and_update(
+        {"$or": [{"status": "queued"}, {"status": "running", "updated_at": {"$lt": stale_before}}]},
+        {"$set": {"status": "running", "updated_at": now()}, "$inc": {"attempts": 1}},
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+
+async def run_job(job):
+    # skip the write if the text was edited again since this job was queued
+    unchanged = {job["text_field"]: job["text"]}
+
+    try:
+        evaluation = await evaluate_prompt_cached(job["text"])
+        accuracy = evaluation.get("accuracy")
+
+        await prompt_repo.update_by_id(job["doc_id"], {job["accuracy_field"]: accuracy}, unchanged)
+        await jobs_collection().update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": "done", "accuracy": accuracy, "error": None, "updated_at": now()}}
+        )
+
+    except asyncio.CancelledError:
+        # worker stopped (shutdown / redeploy): hand the job back right away, this attempt doesn't count
+        await jobs_collection().update_one(
+            {"_id": job["_id"], "status": "running"},
+            {"$set": {"status": "queued", "updated_at": now()}, "$inc": {"attempts": -1}}
+        )
+        raise
+
+    except Exception as e:
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+
+        if job["attempts"] < EVALUATION_MAX_ATTEMPTS:
+            await jobs_collection().update_one(
+                {"_id": job["_id"]},
+                {"$set": {"status": "queued", "error": str(e), "updated_at": now()}}
+            )
+            return
+
+        await prompt_repo.update_by_id(job["doc_id"], {job["accuracy_field"]: FAILED_ACCURACY}, unchanged)
+        await jobs_collection().update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": "failed", "error": str(e), "updated_at": now()}}
+        )
+
+
+async def evaluation_worker():
+    while True:
+        try:
+            job = await claim_job()
+
+            if job is None:
+                # nothing queued; sleep until a local enqueue or the next poll (jobs from other processes)
+                job_available.clear()
+                try:
+                    await asyncio.wait_for(job_available.wait(), timeout=EVALUATION_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await run_job(job)
+
+        except Exception as e:
+            # MongoDB unreachable etc.: keep the worker alive and retry after a pause; a job whose status
+            # could not be written stays "running" and is reclaimed once stale. Only cancellation stops it
+            print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+            await asyncio.sleep(EVALUATION_POLL_INTERVAL)
+
+
+async def start_evaluation_workers():
+    """ start the worker pool (jobs abandoned by a crashed worker are reclaimed by claim_job) """
+    if not BACKGROUND_EVALUATION:
+        return
+
+    await jobs_collection().create_index([("status", 1), ("created_at", 1)])
+
+    for _ in range(EVALUATION_WORKERS):
+        worker_tasks.append(asyncio.create_task(evaluation_worker()))
+
+
+async def stop_evaluation_workers():
+    for task in worker_tasks:
+        task.cancel()
+
+    await asyncio.gather(*worker_tasks, return_exceptions=True)
+    worker_tasks.clear()
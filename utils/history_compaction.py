@@ -0,0 +1,185 @@
+import os
+import json
+
+from langchain_core.messages import SystemMessage, RemoveMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+# turns (user request + generated function) always sent verbatim
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", 3))
+# approximate prompt tokens allowed for the conversation before older turns are compacted
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", 4000))
+# characters of each older request kept in the summary
+SUMMARY_REQUEST_CHARS = 200
+
+SUMMARY_ID = "history-summary"
+
+compaction_stats = {
+    "runs": 0,
+    "compactions": 0,
+    "tokens_before": 0,
+    "tokens_after": 0,
+    "tokens_saved": 0,
+    # compactions where the summary itself had to be cut to fit the budget, and the tokens that removed
+    "summary_trims": 0,
+    "summary_tokens_trimmed": 0
+}
+
+
+def generated_function(message):
+    """ python_function of a stored return_funcion result, None for any other message """
+    if not isinstance(message.content, str) or not message.content.startswith("{"):
+        return None
+
+    try:
+        return json.loads(message.content).get("python_function")
+    except ValueError:
+        return None
+
+
+def split_turns(messages: list):
+    """ (system messages, previous summary, turns); a turn is a request plus what was generated for it """
+    system = []
+    summary = None
+    turns = []
+
+    for message in messages:
+        if message.id == SUMMARY_ID:
+            summary = message
+
+        elif isinstance(message, SystemMessage):
+            # follow-up requests resend the system message; keep one copy on top
+            if all(message.content != seen.content for seen in system):
+                system.append(message)
+
+        elif turns and generated_function(message) is None and generated_function(turns[-1][-1]) is not None:
+            turns.append([message])
+
+        elif turns:
+            turns[-1].append(message)
+
+        else:
+            turns.append([message])
+
+    return system, summary, turns
+
+
+def summary_message(requests: list, latest_function: str = None, omitted: int = 0):
+    lines = [f"- {request}" for request in requests]
+
+    if omitted:
+        lines.insert(0, f"- ({omitted} earlier requests omitted)")
+
+    content = "Earlier in this session the user asked for:\n" + "\n".join(lines)
+
+    if latest_function:
+        content += "\n\nLatest function generated before the recent turns:\n" + latest_function
+
+    return SystemMessage(
+        content=content,
+        id=SUMMARY_ID,
+        additional_kwargs={"requests": requests, "latest_function": latest_function, "omitted_requests": omitted}
+    )
+
+
+def summarize(summary, older_turns: list):
+    """ older requests (truncated) plus only the latest function generated among them """
+    requests = list(summary.additional_kwargs["requests"]) if summary else []
+    latest_function = summary.additional_kwargs["latest_function"] if summary else None
+    omitted = summary.additional_kwargs.get("omitted_requests", 0) if summary else 0
+
+    for turn in older_turns:
+        for message in turn:
+            code = generated_function(message)
+
+            if code:
+                latest_function = code
+            elif isinstance(message.content, str):
+                requests.append(" ".join(message.content.split())[:SUMMARY_REQUEST_CHARS])
+
+    return summary_message(requests, latest_function, omitted)
+
+
+def trim_summary(summary, token_budget: int):
+    """ summary cut down to token_budget: the oldest requests go first, then the latest function """
+    if count_tokens_approximately([summary]) <= token_budget:
+        return summary
+
+    requests = summary.additional_kwargs["requests"]
+    latest_function = summary.additional_kwargs["latest_function"]
+    omitted = summary.additional_kwargs["omitted_requests"]
+
+    # fewest oldest requests to drop so the rest fits
+    low, high = min(1, len(requests)), len(requests)
+
+    while low < high:
+        middle = (low + high) // 2
+
+        if count_tokens_approximately([summary_message(requests[middle:], latest_function, omitted + middle)]) <= token_budget:
+            high = middle
+        else:
+            low = middle + 1
+
+    trimmed = summary_message(requests[low:], latest_function, omitted + low)
+
+    if count_tokens_approximately([trimmed]) > token_budget:
+        trimmed = summary_message([], None, omitted + len(requests))
+
+    return trimmed
+
+
+def compact_messages(messages: list, keep_turns: int = HISTORY_KEEP_TURNS, token_budget: int = HISTORY_TOKEN_BUDGET):
+    """ compacted message list, or None when the history already fits the budget """
+    if count_tokens_approximately(messages) <= token_budget:
+        return None
+
+    system, summary, turns = split_turns(messages)
+    keep = max(1, keep_turns)
+
+    # older turns are folded into the summary; keep fewer verbatim turns while still over budget
+    while True:
+        older, recent = turns[:-keep], turns[-keep:]
+        recent_messages = [message for turn in recent for message in turn]
+
+        if older or (keep == 1 and summary):
+            new_summary = summarize(summary, older)
+            compacted = system + [new_summary] + recent_messages
+
+            if count_tokens_approximately(compacted) <= token_budget:
+                return compacted
+
+            if keep == 1:
+                # even with one verbatim turn the summary does not fit: cut it down to what is left of the budget
+                trimmed = trim_summary(new_summary, token_budget - count_tokens_approximately(system + recent_messages))
+
+                compaction_stats["summary_trims"] += 1
+                compaction_stats["summary_tokens_trimmed"] += count_tokens_approximately([new_summary]) - count_tokens_approximately([trimmed])
+
+                return system + [trimmed] + recent_messages
+
+        elif keep == 1:
+            # only the current request is left, nothing more to compact
+            return None
+
+        keep -= 1
+
+
+def compact_history(state: dict):
+    """ graph node: keep system message & latest turns, replace older turns with a summary """
+    messages = state["messages"]
+    compaction_stats["runs"] += 1
+
+    compacted = compact_messages(messages)
+
+    if compacted is None:
+        return {}
+
+    before = count_tokens_approximately(messages)
+    after = count_tokens_approximately(compacted)
+
+    compaction_stats["compactions"] += 1
+    compaction_stats["tokens_before"] += before
+    compaction_stats["tokens_after"] += after
+    compaction_stats["tokens_saved"] += before - after
+
+    return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES)] + compacted}
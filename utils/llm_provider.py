@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+
+from models import return_funcion
+
+# "openai": live model, "fake": local stand-in, "record": live model + save responses, "replay": saved responses only
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-5.1-2025-11-13")
+LLM_RECORDINGS_DIR = os.getenv("LLM_RECORDINGS_DIR", "llm_recordings")
+# replay sleeps for the latency captured at record time
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "false").lower() == "true"
+
+# "fixed:1.5", "uniform:0.5,2", "normal:1.5,0.3" or "lognormal:0.4,0.5" (seconds)
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "fixed:0")
+# JSON file with a list of return_funcion objects, served round robin
+FAKE_LLM_RESPONSES = os.getenv("FAKE_LLM_RESPONSES")
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED")
+
+DEFAULT_FAKE_RESPONSE = {
+    "python_function": (
+        "def customFunction(value):\n"
+        "    try:\n"
+        "        if value is None:\n"
+        "            return {\"status\": \"failed\", \"message\": \"value is required\", \"data\": {}}\n"
+        "        return {\"status\": \"success\", \"message\": \"ok\", \"data\": {\"value\": value}}\n"
+        "    except Exception as e:\n"
+        "        return {\"status\": \"failed\", \"message\": str(e), \"data\": {}}"
+    ),
+    "function_description": "Returns the given value; canned response of the fake LLM provider.",
+    "params_description": [{"param": "value", "pram_type": "str", "param_desc": "value to return"}]
+}
+
+
+def latency_sampler(spec: str, rng: random.Random):
+    """ callable returning one latency (seconds) drawn from the configured distribution """
+    kind, _, values = spec.partition(":")
+    params = [float(value) for value in values.split(",") if value]
+
+    samplers = {
+        "fixed": lambda: params[0],
+        "uniform": lambda: rng.uniform(params[0], params[1]),
+        "normal": lambda: rng.gauss(params[0], params[1]),
+        "lognormal": lambda: rng.lognormvariate(params[0], params[1])
+    }
+
+    if kind not in samplers:
+        raise ValueError(f"Unknown FAKE_LLM_LATENCY distribution '{kind}'")
+
+    return lambda: max(0.0, samplers[kind]())
+
+
+def messages_key(messages: list):
+    """ stable key of a conversation: message types & contents (ids are random per run) """
+    serialized = json.dumps([(message.type, message.content) for message in messages], ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class FakeToolLLM:
+    """ local stand-in for the structured-output model: canned return_funcion results after a sampled delay """
+
+    def __init__(self, latency: str = FAKE_LLM_LATENCY, responses_file: str = FAKE_LLM_RESPONSES, seed: str = FAKE_LLM_SEED):
+        self.rng = random.Random(seed)
+        self.latency = latency_sampler(latency, self.rng)
+
+        if responses_file:
+            with open(responses_file) as file:
+                self.responses = [return_funcion.model_validate(response) for response in json.load(file)]
+        else:
+            self.responses = [return_funcion.model_validate(DEFAULT_FAKE_RESPONSE)]
+
+        self.calls = 0
+
+    async def ainvoke(self, messages: list, config=None):
+        response = self.responses[self.calls % len(self.responses)]
+        self.calls += 1
+
+        await asyncio.sleep(self.latency())
+        return response.model_copy(deep=True)
+
+
+class RecordingLLM:
+    """ calls the live model and saves each response (with its latency) under the conversation's key """
+
+    def __init__(self, llm, directory: str = LLM_RECORDINGS_DIR):
+        self.llm = llm
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    async def ainvoke(self, messages: list, config=None):
+        start = time.perf_counter()
+        result = await self.llm.ainvoke(messages, config)
+
+        recording = {"latency": time.perf_counter() - start, "response": result.model_dump()}
+        path = os.path.join(self.directory, f"{messages_key(messages)}.json")
+        await asyncio.to_thread(self.write, path, recording)
+
+        return result
+
+    @staticmethod
+    def write(path: str, recording: dict):
+        with open(path, "w") as file:
+            json.dump(recording, file, ensure_ascii=False, indent=2)
+
+
+class ReplayLLM:
+    """ serves responses saved by RecordingLLM; an unrecorded conversation is an error, never a live call """
+
+    def __init__(self, directory: str = LLM_RECORDINGS_DIR, replay_latency: bool = LLM_REPLAY_LATENCY):
+        self.directory = directory
+        self.replay_latency = replay_latency
+
+    async def ainvoke(self, messages: list, config=None):
+        key = messages_key(messages)
+        path = os.path.join(self.directory, f"{key}.json")
+
+        try:
+            with open(path) as file:
+                recording = json.load(file)
+        except FileNotFoundError:
+            raise LookupError(f"No recorded LLM response for conversation {key} in {self.directory}")
+
+        if self.replay_latency:
+            await asyncio.sleep(recording["latency"])
+
+        return return_funcion.model_validate(recording["response"])
+
+
+def openai_llm():
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(model=LLM_MODEL, temperature=0)
+    return llm.with_structured_output(return_funcion)
+
+
+def create_llm(provider: str = LLM_PROVIDER):
+    """ structured-output LLM for the tool builder; every provider returns return_funcion from ainvoke """
+    if provider == "fake":
+        return FakeToolLLM()
+
+    if provider == "replay":
+        return ReplayLLM()
+
+    if provider == "record":
+        return RecordingLLM(openai_llm())
+
+    if provider == "openai":
+        return openai_llm()
+
+    raise ValueError(f"Unknown LLM_PROVIDER '{provider}'")
@@ -0,0 +1,184 @@
+import os
+import time
+import asyncio
+from collections import defaultdict
+
+from pymongo import AsyncMongoClient, monitoring
+from pymongo.read_preferences import Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DB_URI = os.getenv("DB_URI")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "vb_platform")
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 5 * 60 * 1000))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 30000))
+# how long a request waits for a free pooled connection before failing
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000))
+# "majority" or a number of nodes
+MONGO_WRITE_CONCERN = os.getenv("MONGO_WRITE_CONCERN", "majority")
+
+# gallery listing & facet reads. Listings are cached (LIBRARY_CACHE_TTL) right after a write invalidates them, so a
+# non-primary preference can pin a lagging secondary's stale page for the whole TTL; only set e.g. "secondaryPreferred"
+# together with a short LIBRARY_CACHE_TTL
+MONGO_LISTING_READ_PREFERENCE = os.getenv("MONGO_LISTING_READ_PREFERENCE", "primary")
+# seconds (90 minimum); -1 means no limit
+MONGO_LISTING_MAX_STALENESS = int(os.getenv("MONGO_LISTING_MAX_STALENESS", -1))
+
+MONGO_PING_TIMEOUT = float(os.getenv("MONGO_PING_TIMEOUT", 2))
+
+READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest
+}
+
+
+def read_preference(name: str, max_staleness: int = MONGO_LISTING_MAX_STALENESS):
+    if name == "primary":
+        return Primary()
+
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference '{name}'")
+
+    return READ_PREFERENCES[name](max_staleness=max_staleness)
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """ connection pool counters per server, fed by pymongo's CMAP events """
+
+    def __init__(self):
+        self.servers = defaultdict(lambda: defaultdict(int))
+
+    def server(self, event):
+        return self.servers[f"{event.address[0]}:{event.address[1]}"]
+
+    def pool_created(self, event):
+        self.server(event)["pools_created"] += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.server(event)["pool_cleared"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.server(event)["open"] += 1
+        self.server(event)["created"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.server(event)["open"] -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.server(event)["checkout_failed"] += 1
+
+    def connection_checked_out(self, event):
+        self.server(event)["in_use"] += 1
+        self.server(event)["checked_out"] += 1
+
+    def connection_checked_in(self, event):
+        self.server(event)["in_use"] -= 1
+
+    def snapshot(self):
+        return {address: dict(counters) for address, counters in self.servers.items()}
+
+
+class MongoManager:
+    """ owns the AsyncMongoClient. The app lifespan opens it once per worker (after gunicorn forks)
+    and closes it on shutdown; scripts get one lazily on first use """
+
+    def __init__(self, uri: str = DB_URI, db_name: str = MONGO_DB_NAME, **client_options):
+        self.uri = uri
+        self.db_name = db_name
+        self.client_options = client_options
+        self.client = None
+        self.pool_stats = None
+        self.collections = {}
+
+    def open(self):
+        if self.client is not None:
+            return
+
+        self.pool_stats = PoolStats()
+        options = {
+            "maxPoolSize": MONGO_MAX_POOL_SIZE,
+            "minPoolSize": MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+            "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+            "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "w": int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN,
+            **self.client_options
+        }
+
+        self.client = AsyncMongoClient(self.uri, event_listeners=[self.pool_stats], **options)
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+
+        self.client = None
+        self.collections = {}
+
+    @property
+    def database(self):
+        self.open()
+        return self.client[self.db_name]
+
+    def collection(self, name: str, read_preference_name: str = None):
+        """ collection handle, optionally with a non-primary read preference """
+        if self.client is None:
+            self.open()
+
+        key = (name, read_preference_name)
+
+        if key not in self.collections:
+            collection = self.database[name]
+
+            if read_preference_name:
+                collection = collection.with_options(read_preference=read_preference(read_preference_name))
+
+            self.collections[key] = collection
+
+        return self.collections[key]
+
+    async def ping(self, timeout: float = MONGO_PING_TIMEOUT):
+        """ round trip time of a ping in ms """
+        start = time.perf_counter()
+        await asyncio.wait_for(self.database.command("ping"), timeout)
+        return round((time.perf_counter() - start) * 1000, 2)
+
+    def stats(self):
+        if self.client is None:
+            return {"connected": False}
+
+        return {
+            "connected": True,
+            "max_pool_size": self.client.options.pool_options.max_pool_size,
+            "min_pool_size": self.client.options.pool_options.min_pool_size,
+            "servers": self.pool_stats.snapshot()
+        }
+
+
+mongo = MongoManager()
+
+
+def get_mongo():
+    """ FastAPI dependency """
+    return mongo
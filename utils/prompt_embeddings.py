@@ -0,0 +1,138 @@
+import os
+import asyncio
+import importlib
+
+from bson.objectid import ObjectId
+
+from utils.vectors import HashingEmbedder, VectorIndex
+from utils.cache import SharedVersion
+from utils.prompt_repository import prompt_repo
+
+# "hashing" (offline, default) or "package.module:factory" returning an object with .dim & .embed(text)
+PROMPT_EMBEDDER = os.getenv("PROMPT_EMBEDDER", "hashing")
+PROMPT_DUPLICATE_THRESHOLD = float(os.getenv("PROMPT_DUPLICATE_THRESHOLD", 0.92))
+
+
+def load_embedder():
+    if PROMPT_EMBEDDER == "hashing":
+        return HashingEmbedder()
+
+    module_name, factory_name = PROMPT_EMBEDDER.split(":")
+    return getattr(importlib.import_module(module_name), factory_name)()
+
+
+class SimilarityIndex:
+    """ vector index over prompt bodies; built lazily, then kept current from repository change events.
+    Writes made through other workers show up as a newer shared version & trigger a rebuild """
+
+    def __init__(self):
+        self.embedder = load_embedder()
+        self.index = None
+        self.lock = asyncio.Lock()
+        # change events that arrive while the index is being built
+        self.pending = None
+        self.version = SharedVersion("prompt_similarity")
+        # shared version the index reflects
+        self.seen = None
+
+    def build(self, docs: list):
+        index = VectorIndex(self.embedder.dim, capacity=max(1024, len(docs)))
+
+        for doc in docs:
+            index.upsert(str(doc["_id"]), self.embedder.embed(doc.get("prompt")), doc.get("service_type"))
+
+        return index
+
+    async def get_index(self):
+        async with self.lock:
+            current = await self.version.current()
+
+            if self.index is None or current != self.seen:
+                self.pending = []
+
+                try:
+                    projection = {"prompt": 1, "service_type": 1}
+                    docs = [doc async for doc in prompt_repo.iter_documents({"component_type": "prompt"}, projection)]
+
+                    # embedding the whole library is CPU bound, keep it off the event loop
+                    self.index = await asyncio.to_thread(self.build, docs)
+                    self.seen = current
+
+                    for event in self.pending:
+                        self.apply(*event)
+                finally:
+                    self.pending = None
+
+        return self.index
+
+    async def on_change(self, action: str, doc_id, fields: dict = None):
+        if self.pending is not None:
+            self.pending.append((action, doc_id, fields))
+        elif self.index is not None:
+            self.apply(action, doc_id, fields)
+
+        version = await self.version.bump()
+
+        # our own write, already applied; any other gap is a write made elsewhere
+        if self.pending is None and self.seen is not None and version == self.seen + 1:
+            self.seen = version
+
+    def apply(self, action: str, doc_id, fields: dict = None):
+        if action == "insert_many":
+            for doc in fields:
+                self.apply("insert", doc["_id"], doc)
+            return
+
+        doc_id = str(doc_id)
+
+        if action == "delete":
+            self.index.remove(doc_id)
+
+        elif action == "insert" and fields.get("component_type") == "prompt":
+            self.index.upsert(doc_id, self.embedder.embed(fields.get("prompt")), fields.get("service_type"))
+
+        elif action == "update" and doc_id in self.index.rows:
+            if "prompt" in fields:
+                row = self.index.rows[doc_id]
+                self.index.vectors[row] = self.embedder.embed(fields["prompt"])
+
+            if "service_type" in fields:
+                self.index.set_label(doc_id, fields["service_type"])
+
+    async def similar(self, text: str = None, prompt_id: str = None, top_k: int = 5, service_type: str = None):
+        """ nearest prompts to a text or to an existing prompt (which is left out of the results) """
+        index = await self.get_index()
+
+        if prompt_id:
+            row = index.rows.get(prompt_id)
+
+            if row is None:
+                return None
+
+            vector = index.vectors[row].copy()
+        else:
+            vector = self.embedder.embed(text)
+
+        return index.top_k(vector, top_k, service_type, exclude=prompt_id)
+
+    async def find_duplicates(self, text: str, service_type: str = None, threshold: float = PROMPT_DUPLICATE_THRESHOLD):
+        matches = await self.similar(text=text, top_k=5, service_type=service_type)
+        return [(doc_id, score) for doc_id, score in matches if score >= threshold]
+
+
+similarity_index = SimilarityIndex()
+prompt_repo.add_change_listener(similarity_index.on_change)
+
+
+async def with_prompt_metadata(matches: list):
+    """ attach prompt metadata (no body) to [(doc_id, score)] matches, keeping their order """
+    docs = await prompt_repo.find(
+        {"_id": {"$in": [ObjectId(doc_id) for doc_id, _ in matches]}},
+        {"service_type": 1, "language": 1, "use_case": 1, "agent_type": 1, "prompt_accuracy": 1}
+    )
+    by_id = {str(doc.pop("_id")): doc for doc in docs}
+
+    return [
+        {"prompt_id": doc_id, "similarity": round(score, 4), **by_id[doc_id]}
+        for doc_id, score in matches if doc_id in by_id
+    ]
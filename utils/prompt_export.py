@@ -0,0 +1,52 @@
+import json
+import zlib
+import traceback
+
+from utils.prompt_repository import prompt_repo
+
+# flush to the client once this many bytes are buffered
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def export_record(doc: dict):
+    """ one NDJSON line; ids are renamed the same way the listing endpoints do """
+    id_field = "prompt_component_id" if doc.get("component_type") == "prompt_component" else "prompt_id"
+    doc[id_field] = str(doc.pop("_id"))
+
+    return json.dumps(doc, default=str, ensure_ascii=False) + "\n"
+
+
+async def export_ndjson(db_query: dict, compress: bool = False):
+    """ stream matching library documents as NDJSON (gzip compressed on the fly when compress=True) """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = []
+    buffered = 0
+
+    def encode(data: bytes):
+        return compressor.compress(data) if compressor else data
+
+    try:
+        async for doc in prompt_repo.iter_documents(db_query):
+            line = export_record(doc).encode("utf-8")
+            buffer.append(line)
+            buffered += len(line)
+
+            if buffered >= EXPORT_CHUNK_SIZE:
+                chunk = encode(b"".join(buffer))
+                buffer, buffered = [], 0
+
+                if chunk:
+                    yield chunk
+
+        chunk = encode(b"".join(buffer))
+
+        if compressor:
+            chunk += compressor.flush()
+
+        if chunk:
+            yield chunk
+
+    except Exception as e:
+        # headers are already sent, so the client only sees a truncated stream
+        print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+        raise
@@ -0,0 +1,161 @@
+import os
+import json
+import asyncio
+
+from pydantic import ValidationError
+
+from models import new_prompt
+from utils.prompt_repository import prompt_repo
+from utils.evaluation_cache import evaluate_prompt_cached
+from utils.evaluation_jobs import BACKGROUND_EVALUATION, PENDING_ACCURACY, enqueue_evaluations
+
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 500))
+BULK_IMPORT_MAX_ITEMS = int(os.getenv("BULK_IMPORT_MAX_ITEMS", 20000))
+
+
+def build_prompt_document(user_req: dict):
+    """ library document for a new_prompt request """
+    return {
+        "service_type": user_req.get("service_type", "").capitalize(),
+        "prompt_accuracy": "",
+        "prompt": user_req.get("prompt"),
+        "agent_type": user_req.get("agent_type"),
+        "use_case": user_req.get("use_case").capitalize(),
+        "language": user_req.get("language").capitalize(),
+        "component_type": "prompt"
+    }
+
+
+async def iter_import_records(request):
+    """ yield raw records from a JSON array body or an NDJSON stream (read line by line) """
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" not in content_type:
+        records = json.loads(await request.body())
+
+        if not isinstance(records, list):
+            raise ValueError("Request body must be a JSON array of prompts")
+
+        for record in records:
+            yield record
+        return
+
+    pending = b""
+
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+
+        for line in lines:
+            if line.strip():
+                yield parse_line(line)
+
+    if pending.strip():
+        yield parse_line(pending)
+
+
+def parse_line(line: bytes):
+    """ a malformed NDJSON line is passed on as text so it fails validation as a single item """
+    try:
+        return json.loads(line)
+    except ValueError:
+        return line.decode("utf-8", errors="replace")
+
+
+async def evaluate_chunk(documents: list):
+    """ fill prompt_accuracy for a chunk; evaluations run concurrently within the evaluator's in-flight limit """
+    if BACKGROUND_EVALUATION:
+        for doc in documents:
+            doc["prompt_accuracy"] = PENDING_ACCURACY
+        return [None] * len(documents)
+
+    evaluations = await asyncio.gather(
+        *(evaluate_prompt_cached(doc["prompt"]) for doc in documents),
+        return_exceptions=True
+    )
+
+    errors = []
+    for doc, evaluation in zip(documents, evaluations):
+        if isinstance(evaluation, Exception):
+            errors.append(f"evaluation failed: {evaluation}")
+        else:
+            doc["prompt_accuracy"] = evaluation.get("accuracy")
+            errors.append(None)
+
+    return errors
+
+
+async def import_chunk(chunk: list, results: list):
+    """ evaluate & insert one chunk of (index, document) pairs, appending per-item results """
+    errors = await evaluate_chunk([doc for _, doc in chunk])
+
+    evaluated = []
+    for (index, doc), error in zip(chunk, errors):
+        if error:
+            results.append({"index": index, "status": "Failed", "error": error})
+        else:
+            evaluated.append((index, doc))
+
+    if not evaluated:
+        return
+
+    write_errors = await prompt_repo.insert_many([doc for _, doc in evaluated])
+
+    inserted = []
+    for position, (index, doc) in enumerate(evaluated):
+        if position in write_errors:
+            results.append({"index": index, "status": "Failed", "error": write_errors[position]})
+        else:
+            result = {"index": index, "status": "Success", "prompt_id": str(doc["_id"])}
+            inserted.append((result, doc))
+            results.append(result)
+
+    if BACKGROUND_EVALUATION and inserted:
+        job_ids = await enqueue_evaluations([(doc["_id"], doc["prompt"], "prompt", "prompt_accuracy") for _, doc in inserted])
+
+        for (result, _), job_id in zip(inserted, job_ids):
+            result["evaluation_job_id"] = job_id
+
+
+async def bulk_import_prompts(records):
+    """ validate, evaluate and insert prompts in chunks; returns a per-item report """
+    results = []
+    chunk = []
+    index = -1
+
+    async for index, record in aenumerate(records):
+        if index >= BULK_IMPORT_MAX_ITEMS:
+            results.append({"index": index, "status": "Failed", "error": f"limit of {BULK_IMPORT_MAX_ITEMS} prompts per request reached; remaining records were not imported"})
+            break
+
+        try:
+            user_req = new_prompt.model_validate(record).model_dump()
+        except ValidationError as e:
+            results.append({"index": index, "status": "Failed", "error": e.errors(include_url=False, include_context=False)})
+            continue
+
+        chunk.append((index, build_prompt_document(user_req)))
+
+        if len(chunk) >= BULK_IMPORT_CHUNK_SIZE:
+            await import_chunk(chunk, results)
+            chunk = []
+
+    if chunk:
+        await import_chunk(chunk, results)
+
+    results.sort(key=lambda result: result["index"])
+    inserted = sum(1 for result in results if result["status"] == "Success")
+
+    return {
+        "total": index + 1,
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results
+    }
+
+
+async def aenumerate(iterable):
+    index = 0
+    async for item in iterable:
+        yield index, item
+        index += 1
@@ -0,0 +1,207 @@
+import re
+import inspect
+import traceback
+
+from pymongo.errors import BulkWriteError
+from bson.objectid import ObjectId
+
+from utils.mongo import mongo, MongoManager, MONGO_LISTING_READ_PREFERENCE
+
+FACET_FIELDS = ("service_type", "language")
+
+# filterable fields get a lowercase shadow copy ("<field>_lc") so filters are index-backed exact/prefix matches
+FILTER_FIELDS = ("service_type", "language")
+SHADOW_PROJECTION = {f"{field}_lc": 0 for field in FILTER_FIELDS}
+
+
+def with_shadow_fields(fields: dict):
+    """ return fields with lowercase shadow copies of the filterable fields added """
+    shadow = {f"{field}_lc": fields[field].lower() for field in FILTER_FIELDS if isinstance(fields.get(field), str)}
+    return {**fields, **shadow}
+
+
+def listing_projection(body_field: str, fields: str = None, metadata_only: bool = False):
+    """ projection for listing endpoints: comma separated fields to include, or everything but the body """
+    if fields:
+        return {field.strip(): 1 for field in fields.split(",") if field.strip() and not field.strip().startswith("$")}
+
+    if metadata_only:
+        return {**SHADOW_PROJECTION, body_field: 0}
+
+    return None
+
+
+def library_query(component_type: str = None, service_type: str = None, language: str = None, prefix: bool = False):
+    """ filter combining every supplied field, on the shadow fields; prefix matches are anchored so they stay on the index """
+    def match(value):
+        value = value.strip().lower()
+        return {"$regex": f"^{re.escape(value)}"} if prefix else value
+
+    query = {}
+
+    if component_type:
+        query["component_type"] = component_type
+
+    if service_type:
+        query["service_type_lc"] = match(service_type)
+
+    if language:
+        query["language_lc"] = match(language)
+
+    return query
+
+
+def prompts_query(service_type: str, language: str = None, prefix: bool = False):
+    """ build the /prompts filter """
+    return library_query("prompt", service_type, language, prefix)
+
+
+class PromptRepository:
+    """ Async data access layer for the prompt library collection """
+
+    def __init__(self, collection_name: str, read_preference: str = None, manager: MongoManager = mongo, change_listeners: list = None):
+        self.collection_name = collection_name
+        self.read_preference = read_preference
+        self.manager = manager
+        self.change_listeners = [] if change_listeners is None else change_listeners
+
+    @property
+    def collection(self):
+        """ resolved on every use so the repository follows the client opened by the app lifespan """
+        return self.manager.collection(self.collection_name, self.read_preference)
+
+    def listing_view(self, read_preference: str = MONGO_LISTING_READ_PREFERENCE):
+        """ same collection with the gallery listing read preference; shares the change listeners """
+        return PromptRepository(self.collection_name, read_preference, self.manager, self.change_listeners)
+
+    def add_change_listener(self, listener):
+        """ register a callable (or coroutine function) invoked as listener(action, doc_id, fields) after every write;
+        fields is the inserted document, the list of inserted documents (insert_many), the $set fields of an update, or None for a delete """
+        self.change_listeners.append(listener)
+
+    async def notify_change(self, action: str, doc_id, fields: dict = None):
+        """ best effort: the write has already committed, so a failing listener (e.g. Redis down) is logged and the
+        others still run; what it caches stays stale until its TTL """
+        for listener in self.change_listeners:
+            try:
+                result = listener(action, doc_id, fields)
+
+                if inspect.isawaitable(result):
+                    await result
+
+            except Exception as e:
+                print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+
+    async def ensure_indexes(self):
+        for field in FACET_FIELDS:
+            await self.collection.create_index([("component_type", 1), (field, 1)])
+
+        # trailing _id keeps keyset pagination (sort on _id) on the index
+        await self.collection.create_index([("component_type", 1), ("_id", 1)])
+        await self.collection.create_index([("component_type", 1), ("service_type_lc", 1), ("_id", 1)])
+        await self.collection.create_index([("component_type", 1), ("service_type_lc", 1), ("language_lc", 1), ("_id", 1)])
+
+    async def migrate_shadow_fields(self):
+        """ backfill lowercase shadow fields on documents written before they existed """
+        for field in FILTER_FIELDS:
+            await self.collection.update_many(
+                {f"{field}_lc": {"$exists": False}, field: {"$type": "string"}},
+                [{"$set": {f"{field}_lc": {"$toLower": f"${field}"}}}]
+            )
+
+    async def get_facet(self, field: str):
+        """ distinct values of a prompt field """
+        values = await self.collection.distinct(field, {"component_type": "prompt"})
+        return sorted(value for value in values if value is not None)
+
+    async def find(self, query: dict, projection: dict = None):
+        """ return all documents matching the query (shadow fields are left out) """
+        cursor = self.collection.find(query, projection or SHADOW_PROJECTION)
+        return await cursor.to_list()
+
+    async def find_page(self, query: dict, after: str = None, limit: int = None, projection: dict = None):
+        """ keyset page of documents ordered by _id; returns (documents, cursor of the next page or None) """
+        if after:
+            query = {**query, "_id": {"$gt": ObjectId(after)}}
+
+        cursor = self.collection.find(query, projection or SHADOW_PROJECTION).sort("_id", 1)
+
+        if limit:
+            # fetch one extra document to know whether another page exists
+            cursor = cursor.limit(limit + 1)
+
+        docs = await cursor.to_list()
+
+        if limit and len(docs) > limit:
+            docs = docs[:limit]
+            return docs, str(docs[-1]["_id"])
+
+        return docs, None
+
+    async def iter_documents(self, query: dict, projection: dict = None, batch_size: int = 500):
+        """ async iterate matching documents straight off the cursor, in _id order """
+        cursor = self.collection.find(query, projection or SHADOW_PROJECTION, batch_size=batch_size).sort("_id", 1)
+
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            await cursor.close()
+
+    async def count(self, query: dict):
+        return await self.collection.count_documents(query)
+
+    async def insert_one(self, document: dict):
+        result = await self.collection.insert_one(with_shadow_fields(document))
+        await self.notify_change("insert", result.inserted_id, document)
+        return result.inserted_id
+
+    async def insert_many(self, documents: list):
+        """ unordered bulk insert; sets _id on each document & returns {position: error} for failed ones """
+        for doc in documents:
+            doc.setdefault("_id", ObjectId())
+
+        try:
+            await self.collection.insert_many([with_shadow_fields(doc) for doc in documents], ordered=False)
+            errors = {}
+
+        except BulkWriteError as e:
+            errors = {error["index"]: error.get("errmsg") for error in e.details.get("writeErrors", [])}
+
+        inserted = [doc for position, doc in enumerate(documents) if position not in errors]
+
+        if inserted:
+            await self.notify_change("insert_many", None, inserted)
+
+        return errors
+
+    async def update_by_id(self, doc_id: str, fields: dict, condition: dict = None):
+        """ set given fields on a document (optionally only if it matches condition); returns number of modified documents """
+        query = {"_id": ObjectId(doc_id), **(condition or {})}
+        result = await self.collection.update_one(query, {"$set": with_shadow_fields(fields)})
+        if result.modified_count:
+            await self.notify_change("update", ObjectId(doc_id), fields)
+
+        return result.modified_count
+
+    async def delete_by_id(self, doc_id: str):
+        """ delete a document; returns number of deleted documents """
+        result = await self.collection.delete_one({"_id": ObjectId(doc_id)})
+        if result.deleted_count:
+            await self.notify_change("delete", ObjectId(doc_id))
+
+        return result.deleted_count
+
+
+prompt_repo = PromptRepository("prompt_library")
+listing_repo = prompt_repo.listing_view()
+
+
+def get_prompt_repo():
+    """ FastAPI dependency: primary reads & writes """
+    return prompt_repo
+
+
+def get_listing_repo():
+    """ FastAPI dependency: gallery listing & facet reads (MONGO_LISTING_READ_PREFERENCE, primary by default) """
+    return listing_repo
@@ -0,0 +1,242 @@
+import os
+import re
+import math
+import difflib
+import asyncio
+from collections import defaultdict, Counter
+
+from pymongo.errors import OperationFailure
+
+from utils.cache import SharedVersion
+from utils.prompt_repository import prompt_repo, SHADOW_PROJECTION
+
+# "mongo": $text index (falls back to memory if unavailable), "memory": in-process inverted index (local testing;
+# holds every library document in each worker). Fuzzy term matching is only available on the memory index
+PROMPT_SEARCH_BACKEND = os.getenv("PROMPT_SEARCH_BACKEND", "mongo")
+
+# searchable fields & their relevance weights (also used for the Mongo text index)
+SEARCH_WEIGHTS = {"use_case": 5, "prompt": 1, "prompt_component": 1}
+
+SNIPPET_LENGTH = 160
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else []
+
+
+def stem(term: str):
+    """ crude suffix strip so highlights also catch inflected forms matched by the text index """
+    for suffix in ("ing", "es", "ed", "s"):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 4:
+            return term[:-len(suffix)]
+
+    return term
+
+
+def highlight(text: str, terms: set):
+    """ snippet around the first matched term, with matches wrapped in <em> """
+    if not isinstance(text, str) or not terms:
+        return None
+
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\w*", re.IGNORECASE)
+    first = pattern.search(text)
+
+    if not first:
+        return None
+
+    start = max(0, first.start() - SNIPPET_LENGTH // 3)
+
+    # don't cut the snippet in the middle of a word
+    if start > 0:
+        space = text.find(" ", start, first.start())
+        start = space + 1 if space != -1 else first.start()
+    end = min(len(text), start + SNIPPET_LENGTH)
+    snippet = pattern.sub(lambda match: f"<em>{match.group(0)}</em>", text[start:end])
+
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+
+
+def highlights(doc: dict, terms: set):
+    result = {}
+    terms = {stem(term) for term in terms}
+
+    for field in SEARCH_WEIGHTS:
+        snippet = highlight(doc.get(field), terms)
+        if snippet:
+            result[field] = snippet
+
+    return result
+
+
+def matches_filters(doc: dict, filters: dict):
+    for field, value in filters.items():
+        if field == "component_type":
+            if doc.get("component_type") != value:
+                return False
+        elif str(doc.get(field, "")).lower() != value:
+            return False
+
+    return True
+
+
+class InvertedIndex:
+    """ in-process BM25 index over the searchable fields, with fuzzy term expansion """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.doc_length = {}
+        self.docs = {}
+
+    def add(self, doc: dict):
+        doc_id = str(doc["_id"])
+        counts = Counter()
+
+        for field, weight in SEARCH_WEIGHTS.items():
+            for token in tokenize(doc.get(field)):
+                counts[token] += weight
+
+        for token, count in counts.items():
+            self.postings[token][doc_id] = count
+
+        self.doc_length[doc_id] = sum(counts.values())
+        self.docs[doc_id] = doc
+
+    def expand(self, term: str, fuzzy: bool):
+        """ (term, weight) pairs for a query term: exact & prefix matches, plus close spellings when fuzzy """
+        expanded = {term: 1.0} if term in self.postings else {}
+
+        for token in self.postings:
+            if token != term and token.startswith(term) and len(term) >= 3:
+                expanded.setdefault(token, 0.8)
+
+        if fuzzy:
+            for token in difflib.get_close_matches(term, self.postings.keys(), n=3, cutoff=0.75):
+                expanded.setdefault(token, 0.6)
+
+        return expanded
+
+    def search(self, query: str, filters: dict, skip: int, limit: int, fuzzy: bool = True):
+        total_docs = len(self.docs) or 1
+        avg_length = sum(self.doc_length.values()) / total_docs
+        scores = defaultdict(float)
+        matched_terms = set()
+
+        for term in set(tokenize(query)):
+            for token, weight in self.expand(term, fuzzy).items():
+                matched_terms.add(token)
+                postings = self.postings[token]
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+
+                for doc_id, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_length[doc_id] / avg_length)
+                    scores[doc_id] += weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(
+            ((score, self.docs[doc_id]) for doc_id, score in scores.items() if matches_filters(self.docs[doc_id], filters)),
+            key=lambda item: item[0],
+            reverse=True
+        )
+
+        return [{**doc, "score": round(score, 4)} for score, doc in ranked[skip:skip + limit]], matched_terms
+
+
+class MemorySearch:
+    """ lazily built inverted index, kept current from repository change events;
+    writes made through other workers show up as a newer shared version & trigger a rebuild """
+
+    def __init__(self):
+        self.index = None
+        self.lock = asyncio.Lock()
+        self.version = SharedVersion("prompt_search")
+        # shared version the index reflects
+        self.seen = None
+
+    def apply(self, action: str, doc_id, fields: dict = None):
+        if action == "insert_many":
+            for doc in fields:
+                self.apply("insert", doc["_id"], doc)
+
+        elif action == "insert":
+            self.index.add({**fields, "_id": doc_id})
+
+        elif action == "update" and not SEARCH_WEIGHTS.keys() & fields.keys() and str(doc_id) in self.index.docs:
+            # metadata only (e.g. a background accuracy update): postings are unaffected
+            self.index.docs[str(doc_id)].update(fields)
+
+        else:
+            # edited text or a delete; postings are not removable, rebuild on the next search
+            self.index = None
+
+    async def on_change(self, action: str, doc_id, fields: dict = None):
+        if self.index is not None:
+            self.apply(action, doc_id, fields)
+
+        version = await self.version.bump()
+
+        # our own write, already applied; any other gap is a write made elsewhere
+        if self.index is not None and self.seen is not None and version == self.seen + 1:
+            self.seen = version
+
+    async def get_index(self):
+        async with self.lock:
+            current = await self.version.current()
+
+            if self.index is None or current != self.seen:
+                index = InvertedIndex()
+
+                async for doc in prompt_repo.iter_documents({}):
+                    index.add(doc)
+
+                self.index = index
+                self.seen = current
+
+        return self.index
+
+
+memory_search = MemorySearch()
+prompt_repo.add_change_listener(memory_search.on_change)
+
+
+async def ensure_text_index():
+    await prompt_repo.collection.create_index(
+        [(field, "text") for field in SEARCH_WEIGHTS],
+        weights=SEARCH_WEIGHTS,
+        name="prompt_text_search"
+    )
+
+
+async def mongo_search(query: str, filters: dict, skip: int, limit: int):
+    db_query = {"$text": {"$search": query}}
+
+    for field, value in filters.items():
+        db_query[field if field == "component_type" else f"{field}_lc"] = value
+
+    projection = {**SHADOW_PROJECTION, "score": {"$meta": "textScore"}}
+    cursor = prompt_repo.collection.find(db_query, projection)
+    cursor = cursor.sort([("score", {"$meta": "textScore"})]).skip(skip).limit(limit)
+
+    return await cursor.to_list()
+
+
+async def search_prompts(query: str, filters: dict, skip: int = 0, limit: int = 20, fuzzy: bool = False):
+    """ relevance ranked search over prompt bodies & use cases; returns documents with score & highlights """
+    terms = set(tokenize(query))
+
+    if PROMPT_SEARCH_BACKEND == "mongo":
+        # the $text index already matches stemmed forms; fuzzy spelling matches need the memory backend
+        try:
+            docs = await mongo_search(query, filters, skip, limit)
+            return [{**doc, "highlights": highlights(doc, terms)} for doc in docs]
+
+        except OperationFailure as e:
+            print(f"\nText search unavailable, using in-process index; Error: {e}")
+
+    index = await memory_search.get_index()
+    docs, matched_terms = index.search(query, filters, skip, limit, fuzzy)
+
+    return [{**doc, "highlights": highlights(doc, matched_terms)} for doc in docs]
@@ -1,10 +1,29 @@
 import os
 import re
-import requests
+import random
+import asyncio
+
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
 
+PROMPT_EVALUATOR_URL = os.getenv("PROMPT_EVALUATOR_URL")
+
+# evaluator client settings
+EVALUATOR_TIMEOUT = float(os.getenv("PROMPT_EVALUATOR_TIMEOUT", 60))
+EVALUATOR_CONNECT_TIMEOUT = float(os.getenv("PROMPT_EVALUATOR_CONNECT_TIMEOUT", 5))
+EVALUATOR_MAX_CONCURRENCY = int(os.getenv("PROMPT_EVALUATOR_MAX_CONCURRENCY", 8))
+EVALUATOR_MAX_RETRIES = int(os.getenv("PROMPT_EVALUATOR_MAX_RETRIES", 2))
+EVALUATOR_BACKOFF = float(os.getenv("PROMPT_EVALUATOR_BACKOFF", 0.5))
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# shared connection pool & in-flight limit, created on first use
+evaluator_client = None
+evaluator_semaphore = asyncio.Semaphore(EVALUATOR_MAX_CONCURRENCY)
+
+
 def get_accuracy(text):
     pattern = re.compile(r"(\d+\.\d+)%")
 
@@ -15,18 +34,58 @@ def get_accuracy(text):
     else:
         return 0
 
-def evaluate_prompt(prompt):
-    prompt_evaluator_url = os.getenv("PROMPT_EVALUATOR_URL")
 
+def get_evaluator_client():
+    """ return the shared evaluator http client """
+    global evaluator_client
+
+    if evaluator_client is None:
+        evaluator_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(EVALUATOR_TIMEOUT, connect=EVALUATOR_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=EVALUATOR_MAX_CONCURRENCY, max_keepalive_connections=EVALUATOR_MAX_CONCURRENCY)
+        )
+
+    return evaluator_client
+
+
+async def close_evaluator_client():
+    global evaluator_client
+
+    if evaluator_client is not None:
+        await evaluator_client.aclose()
+        evaluator_client = None
+
+
+async def post_evaluation(body):
+    """ post to the evaluator, retrying transient failures with exponential backoff """
+    client = get_evaluator_client()
+
+    for attempt in range(EVALUATOR_MAX_RETRIES + 1):
+        try:
+            async with evaluator_semaphore:
+                response = await client.post(url=PROMPT_EVALUATOR_URL, json=body)
+                response.raise_for_status()
+
+            return response.json()
+
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            retryable = isinstance(e, httpx.TransportError) or e.response.status_code in RETRY_STATUS_CODES
+
+            if not retryable or attempt == EVALUATOR_MAX_RETRIES:
+                raise
+
+            delay = EVALUATOR_BACKOFF * (2 ** attempt) * (1 + random.random())
+            print(f"\nPrompt evaluation failed (attempt {attempt + 1}); Error: {e}; retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def evaluate_prompt(prompt):
     body = {
         "evaluate_target": "assistant",
         "input_text": prompt
     }
 
-    response = requests.post(url=prompt_evaluator_url, json=body)
-    response.raise_for_status
-
-    res_json = response.json()
+    res_json = await post_evaluation(body)
     prompt_text = res_json.get("output_text")
 
     prompt_accuracy = get_accuracy(prompt_text)
@@ -34,4 +93,4 @@ def evaluate_prompt(prompt):
     return {
         "prompt": prompt,
         "accuracy": prompt_accuracy
-    }
\ No newline at end of file
+    }
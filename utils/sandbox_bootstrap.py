@@ -0,0 +1,197 @@
+""" Entry point of a sandboxed tool run (executed in a child process by utils.tool_sandbox).
+
+Reads {"code", "args", "stub_response", "stub_status"} as JSON from stdin, starts the stub
+HTTP server, points every requests / httpx call at it, calls customFunction(**args) and
+writes one JSON report (including the requests the stub received) to stdout.
+
+The isolation comes from the parent: the process runs as an unprivileged user in its own
+network namespace (only loopback, so the stub has to live in here) with resource limits.
+The audit hook installed by confine() only catches mistakes of well-behaved code early
+(a clear error instead of a timeout); Python code can get around it, it is not a boundary.
+"""
+import io
+import os
+import sys
+import json
+import time
+import threading
+import traceback
+import contextlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ORIGINAL_URL_HEADER = "X-Sandbox-Original-Url"
+OUTPUT_LIMIT = 4000
+
+
+class StubServer:
+    """ local HTTP server answering every request with a canned JSON response and recording what it received """
+
+    def __init__(self, response_body=None, response_status: int = 200):
+        self.requests = []
+        body = json.dumps({"status": "success"} if response_body is None else response_body).encode("utf-8")
+        recorded = self.requests
+
+        class Handler(BaseHTTPRequestHandler):
+            def handle_request(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                parts = urlsplit(self.path)
+
+                recorded.append({
+                    "method": self.command,
+                    "url": self.headers.get(ORIGINAL_URL_HEADER),
+                    "path": parts.path,
+                    "params": dict(parse_qsl(parts.query, keep_blank_values=True)),
+                    "headers": {key: value for key, value in self.headers.items() if key != ORIGINAL_URL_HEADER},
+                    "body": self.rfile.read(length).decode("utf-8", errors="replace") if length else None
+                })
+
+                self.send_response(response_status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def to_stub(url: str, stub_url: str):
+    """ same path & query on the stub server """
+    parts = urlsplit(str(url))
+    stub = urlsplit(stub_url)
+    return urlunsplit((stub.scheme, stub.netloc, parts.path or "/", parts.query, ""))
+
+
+def redirect_http(stub_url: str):
+    try:
+        import requests
+
+        original_request = requests.Session.request
+
+        def request(self, method, url, *args, **kwargs):
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), ORIGINAL_URL_HEADER: str(url)}
+            return original_request(self, method, to_stub(url, stub_url), *args, **kwargs)
+
+        requests.Session.request = request
+    except ImportError:
+        pass
+
+    try:
+        import httpx
+
+        def rewrite(request):
+            request.headers[ORIGINAL_URL_HEADER] = str(request.url)
+            request.url = httpx.URL(to_stub(request.url, stub_url))
+
+        original_send = httpx.Client.send
+        original_async_send = httpx.AsyncClient.send
+
+        def send(self, request, *args, **kwargs):
+            rewrite(request)
+            return original_send(self, request, *args, **kwargs)
+
+        async def async_send(self, request, *args, **kwargs):
+            rewrite(request)
+            return await original_async_send(self, request, *args, **kwargs)
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = async_send
+    except ImportError:
+        pass
+
+
+def within(path, roots):
+    return any(path == root or path.startswith(root + os.sep) for root in roots)
+
+
+def confine(stub_url: str):
+    """ audit hook refusing network, filesystem & process access the tool code has no business with
+    (defence in depth only, see the module docstring) """
+    stub = urlsplit(stub_url)
+    workdir = os.path.abspath(os.getcwd())
+    # stdlib, lib-dynload & site-packages (-I keeps the app directory off sys.path)
+    readable = [os.path.abspath(path) for path in sys.path if path and os.path.isdir(path)] + [workdir]
+
+    def path_of(value):
+        return os.path.abspath(os.fsdecode(value))
+
+    def hook(event, args):
+        if event == "open":
+            path, mode, flags = args
+
+            if path is None or isinstance(path, int):
+                return
+
+            writing = any(char in (mode or "") for char in "wax+") or bool((flags or 0) & (os.O_WRONLY | os.O_RDWR | os.O_CREAT))
+
+            if not within(path_of(path), [workdir] if writing else readable):
+                raise PermissionError(f"sandbox: access to {os.fsdecode(path)} is not allowed")
+
+        elif event in ("os.listdir", "os.scandir"):
+            if args[0] is not None and not isinstance(args[0], int) and not within(path_of(args[0]), readable):
+                raise PermissionError(f"sandbox: listing {os.fsdecode(args[0])} is not allowed")
+
+        elif event == "socket.connect":
+            address = args[1]
+
+            if not (isinstance(address, tuple) and address[0] == stub.hostname and address[1] == stub.port):
+                raise PermissionError(f"sandbox: connection to {address} is not allowed")
+
+        elif event in ("socket.getaddrinfo", "socket.gethostbyname", "socket.gethostbyname_ex", "socket.gethostbyaddr"):
+            if args[0] != stub.hostname:
+                raise PermissionError(f"sandbox: resolving {args[0]} is not allowed")
+
+        elif event in BLOCKED_EVENTS:
+            raise PermissionError(f"sandbox: {event} is not allowed")
+
+    sys.addaudithook(hook)
+
+
+BLOCKED_EVENTS = {
+    "socket.sendto", "socket.sendmsg", "socket.bind",
+    "subprocess.Popen", "os.system", "os.exec", "os.posix_spawn", "os.spawn", "os.fork", "os.forkpty", "os.startfile",
+    "os.kill", "os.killpg", "os.symlink", "os.link", "os.chmod", "os.chown",
+    "ctypes.cdata", "ctypes.call_function"
+}
+
+
+def main():
+    job = json.loads(sys.stdin.read())
+    sys.dont_write_bytecode = True
+
+    stub = StubServer(job.get("stub_response"), job.get("stub_status", 200))
+    stub.start()
+    redirect_http(stub.url)
+    confine(stub.url)
+
+    output = io.StringIO()
+    report = {"status": "ok"}
+    start = time.perf_counter()
+
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            namespace = {"__name__": "sandboxed_tool"}
+            exec(compile(job["code"], "<customFunction>", "exec"), namespace)
+            report["return_value"] = namespace["customFunction"](**job["args"])
+
+    except BaseException as e:
+        report = {"status": "error", "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc(limit=5)}
+
+    report["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    report["output"] = output.getvalue()[-OUTPUT_LIMIT:]
+    report["requests"] = list(stub.requests)
+
+    sys.stdout.write(json.dumps(report, default=repr))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import json
+import asyncio
+import traceback
+from uuid import uuid4
+
+from utils.code_helper import get_graph
+
+# tools generated concurrently per batch request (LLM_MAX_CONCURRENCY still caps calls per worker)
+TOOL_BATCH_CONCURRENCY = int(os.getenv("TOOL_BATCH_CONCURRENCY", 8))
+TOOL_BATCH_MAX_ITEMS = int(os.getenv("TOOL_BATCH_MAX_ITEMS", 50))
+
+
+async def build_tool(index: int, user_prompt: str, semaphore: asyncio.Semaphore):
+    """ one batch item in its own conversation thread; failures are reported per item """
+    from langchain_core.messages import HumanMessage
+
+    uu_id = str(uuid4())
+
+    async with semaphore:
+        try:
+            graph = await get_graph()
+            result = await graph.ainvoke(
+                {"messages": [HumanMessage(content=user_prompt)]},
+                config={"configurable": {"thread_id": uu_id}}
+            )
+            content = result["messages"][-1].content
+
+            # code that still broke the generation rules after the re-prompt
+            if json.loads(content).get("validation_errors"):
+                return {"index": index, "status": "Invalid", "result": content, "uu_id": uu_id}
+
+            return {"index": index, "status": "Success", "result": content, "uu_id": uu_id}
+
+        except Exception as e:
+            print(f"\nError: {e}; \nTraceback: {traceback.format_exc()}")
+            return {"index": index, "status": "Failed", "error": f"tool generation failed ({type(e).__name__})"}
+
+
+async def build_tools(user_prompts: list):
+    """ yield per-item results in completion order """
+    semaphore = asyncio.Semaphore(TOOL_BATCH_CONCURRENCY)
+    tasks = [asyncio.create_task(build_tool(index, user_prompt, semaphore)) for index, user_prompt in enumerate(user_prompts)]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+    finally:
+        # client went away mid-stream: stop generating the rest
+        for task in tasks:
+            task.cancel()
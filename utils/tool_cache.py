@@ -0,0 +1,118 @@
+import os
+import re
+import time
+import hashlib
+from collections import OrderedDict
+
+from langchain_core.messages import HumanMessage
+
+from utils.cache import LIBRARY_CACHE_BACKEND, create_cache_backend
+from utils.history_compaction import SUMMARY_ID, generated_function
+from utils.vectors import HashingEmbedder, VectorIndex
+
+TOOL_CACHE_BACKEND = os.getenv("TOOL_CACHE_BACKEND", LIBRARY_CACHE_BACKEND)
+TOOL_CACHE_TTL = int(os.getenv("TOOL_CACHE_TTL", 7 * 24 * 60 * 60))
+# cap of the in-process backend (LRU) and of each worker's similarity index. A redis backend ignores it: there entries
+# are bounded by TOOL_CACHE_TTL only, so give the Redis instance a maxmemory with an allkeys-lru/volatile-lru policy
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", 1024))
+# cosine similarity for reusing a near-identical request's result; 0 disables (exact matches only).
+# Keep it high: "convert date to IST" and "convert date to PST" are close neighbours.
+# The similarity index is per worker; with a redis backend only exact hits are shared between workers.
+TOOL_CACHE_SIMILARITY = float(os.getenv("TOOL_CACHE_SIMILARITY", 0))
+
+TRAILING_PUNCTUATION = re.compile(r"[\s.!?]+$")
+
+
+def normalize_request(text: str):
+    return TRAILING_PUNCTUATION.sub("", " ".join(text.lower().split()))
+
+
+def cacheable_request(messages: list):
+    """ text of a first-turn request; follow-ups depend on the conversation so they are never cached """
+    if not messages or not isinstance(messages[-1], HumanMessage) or not isinstance(messages[-1].content, str):
+        return None
+
+    if any(message.id == SUMMARY_ID or generated_function(message) for message in messages[:-1]):
+        return None
+
+    return messages[-1].content
+
+
+class ToolResponseCache:
+    """ return_funcion results keyed by normalized request text: exact hash first, then (optionally) nearest request """
+
+    def __init__(self, backend, threshold: float = TOOL_CACHE_SIMILARITY, max_entries: int = TOOL_CACHE_MAX_ENTRIES, ttl: int = TOOL_CACHE_TTL):
+        self.backend = backend
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedder = HashingEmbedder()
+        self.vectors = VectorIndex(self.embedder.dim)
+        # keys in the similarity index with their expiry, least recently stored first
+        self.indexed = OrderedDict()
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0}
+
+    def key(self, normalized: str):
+        return "tool:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def nearest(self, normalized: str):
+        now = time.monotonic()
+
+        for key in [key for key, expires_at in self.indexed.items() if expires_at < now]:
+            self.unindex(key)
+
+        matches = self.vectors.top_k(self.embedder.embed(normalized), 1)
+
+        if matches and matches[0][1] >= self.threshold:
+            return matches[0][0]
+
+        return None
+
+    def index(self, key: str, normalized: str):
+        self.vectors.upsert(key, self.embedder.embed(normalized), None)
+        self.indexed[key] = time.monotonic() + self.ttl
+        self.indexed.move_to_end(key)
+
+        while len(self.indexed) > self.max_entries:
+            self.unindex(next(iter(self.indexed)))
+
+    def unindex(self, key: str):
+        self.indexed.pop(key, None)
+        self.vectors.remove(key)
+
+    async def lookup(self, text: str):
+        normalized = normalize_request(text)
+        cached = await self.backend.get(self.key(normalized))
+
+        if cached is not None:
+            self.stats["exact_hits"] += 1
+            return cached
+
+        if self.threshold:
+            key = self.nearest(normalized)
+            cached = await self.backend.get(key) if key else None
+
+            if cached is not None:
+                self.stats["similar_hits"] += 1
+                return cached
+
+        self.stats["misses"] += 1
+        return None
+
+    async def store(self, text: str, result: dict):
+        normalized = normalize_request(text)
+        key = self.key(normalized)
+
+        await self.backend.set(key, result)
+
+        if self.threshold:
+            self.index(key, normalized)
+
+    def get_stats(self):
+        lookups = sum(self.stats.values())
+        hits = self.stats["exact_hits"] + self.stats["similar_hits"]
+
+        return {**self.stats, "hit_ratio": round(hits / lookups, 4) if lookups else 0.0}
+
+
+tool_cache = ToolResponseCache(create_cache_backend(TOOL_CACHE_BACKEND, TOOL_CACHE_MAX_ENTRIES, TOOL_CACHE_TTL))
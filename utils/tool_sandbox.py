@@ -0,0 +1,228 @@
+import os
+import sys
+import json
+import ctypes
+import socket
+import struct
+import asyncio
+import shutil
+import tempfile
+from urllib.parse import urlsplit
+
+from utils.curl_parser import parse_curl_request
+from utils.code_validation import validate_function
+
+SANDBOX_TIMEOUT = float(os.getenv("SANDBOX_TIMEOUT", 10))
+SANDBOX_MEMORY_MB = int(os.getenv("SANDBOX_MEMORY_MB", 512))
+# sandboxed runs executing at the same time (each one is a separate process)
+SANDBOX_MAX_PARALLEL = int(os.getenv("SANDBOX_MAX_PARALLEL", os.cpu_count() or 1))
+# unprivileged account the child runs as (e.g. "nobody"); required when the server runs as root. It must be able to
+# read the Python installation but nothing of the app (the bootstrap is copied into the run's working directory)
+SANDBOX_USER = os.getenv("SANDBOX_USER")
+# processes the sandbox user may own at once (fork bombs)
+SANDBOX_MAX_PROCESSES = int(os.getenv("SANDBOX_MAX_PROCESSES", 32))
+
+BOOTSTRAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_bootstrap.py")
+
+# <linux/sched.h>, <linux/sockios.h>, <net/if.h>
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+SIOCSIFFLAGS = 0x8914
+IFF_UP, IFF_LOOPBACK, IFF_RUNNING = 0x1, 0x8, 0x40
+
+sandbox_slots = asyncio.Semaphore(SANDBOX_MAX_PARALLEL)
+
+
+class SandboxUnavailable(RuntimeError):
+    """ the host cannot isolate generated code, so it is not run at all """
+
+
+def sandbox_account():
+    """ (uid, gid) the child switches to, or None to keep the server's (unprivileged) user """
+    if not sys.platform.startswith("linux"):
+        raise SandboxUnavailable("the tool sandbox needs Linux namespaces")
+
+    import pwd
+
+    if os.geteuid() != 0:
+        return None
+
+    if not SANDBOX_USER:
+        raise SandboxUnavailable("refusing to run generated code as root: set SANDBOX_USER to an unprivileged account")
+
+    try:
+        account = pwd.getpwnam(SANDBOX_USER)
+    except KeyError:
+        raise SandboxUnavailable(f"SANDBOX_USER '{SANDBOX_USER}' does not exist")
+
+    if account.pw_uid == 0:
+        raise SandboxUnavailable("SANDBOX_USER must not be root")
+
+    return account.pw_uid, account.pw_gid
+
+
+def isolation(account):
+    """ preexec_fn: own network namespace with only loopback up, resource limits, then drop to the sandbox user """
+    import fcntl
+    import resource
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    # an unprivileged server needs a user namespace to be allowed to create the network namespace
+    flags = CLONE_NEWNET if account else CLONE_NEWUSER | CLONE_NEWNET
+    memory = SANDBOX_MEMORY_MB * 1024 * 1024
+
+    def isolate():
+        if libc.unshare(flags) != 0:
+            raise OSError(ctypes.get_errno(), "unshare failed")
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            fcntl.ioctl(sock, SIOCSIFFLAGS, struct.pack("16sH22x", b"lo", IFF_UP | IFF_LOOPBACK | IFF_RUNNING))
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        resource.setrlimit(resource.RLIMIT_CPU, (int(SANDBOX_TIMEOUT) + 1, int(SANDBOX_TIMEOUT) + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (1024 * 1024, 1024 * 1024))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (64, 64))
+
+        if account:
+            uid, gid = account
+            resource.setrlimit(resource.RLIMIT_NPROC, (SANDBOX_MAX_PROCESSES, SANDBOX_MAX_PROCESSES))
+            os.setgroups([])
+            os.setgid(gid)
+            os.setuid(uid)
+
+    return isolate
+
+
+async def run_in_sandbox(code: str, args: dict, stub_response=None, stub_status: int = 200, timeout: float = SANDBOX_TIMEOUT):
+    """ execute customFunction(**args) in an isolated child process; returns the bootstrap report """
+    account = sandbox_account()
+    job = json.dumps({"code": code, "args": args, "stub_response": stub_response, "stub_status": stub_status}).encode("utf-8")
+
+    async with sandbox_slots:
+        with tempfile.TemporaryDirectory() as workdir:
+            bootstrap = shutil.copy(BOOTSTRAP, workdir)
+
+            if account:
+                os.chown(workdir, *account)
+                os.chown(bootstrap, *account)
+
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-I", bootstrap,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=workdir,
+                # no app secrets (DB_URI, API keys) leak into generated code
+                env={"PATH": os.environ.get("PATH", ""), "NO_PROXY": "127.0.0.1"},
+                preexec_fn=isolation(account)
+            )
+
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(job), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return {"status": "timeout", "error": f"customFunction did not finish within {timeout}s", "requests": []}
+
+    try:
+        return json.loads(stdout)
+    except ValueError:
+        return {"status": "error", "error": f"sandbox exited with code {process.returncode}", "output": stderr.decode("utf-8", errors="replace")[-4000:], "requests": []}
+
+
+def response_shape(value):
+    """ type skeleton of a return value, e.g. {"status": "str", "data": {"id": "int"}} """
+    if isinstance(value, dict):
+        return {key: response_shape(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [response_shape(value[0])] if value else []
+
+    return type(value).__name__
+
+
+def substitute(value, dynamic: dict, args: dict, path: str = ""):
+    """ expected JSON body: static values from the cURL, dynamic ones from the sample args """
+    if isinstance(value, dict):
+        result = {}
+
+        for key, item in value.items():
+            item_path = f"{path}.{key}" if path else key
+            variable = dynamic.get(item_path) or dynamic.get(key)
+            result[key] = args.get(variable) if variable else substitute(item, dynamic, args, item_path)
+
+        return result
+
+    if isinstance(value, list):
+        return [substitute(item, dynamic, args, path) for item in value]
+
+    return value
+
+
+def compare_with_curl(recorded: dict, curl_command: str, dynamic_map: dict, args: dict):
+    """ differences between the request the tool sent and the one the cURL describes """
+    expected = parse_curl_request(curl_command)
+    dynamic_map = dynamic_map or {}
+    mismatches = []
+
+    if recorded["method"] != expected["method"]:
+        mismatches.append(f"method: expected {expected['method']}, sent {recorded['method']}")
+
+    expected_path = urlsplit(expected["url"]).path or "/"
+    if recorded["path"] != expected_path:
+        mismatches.append(f"path: expected {expected_path}, sent {recorded['path']}")
+
+    for field, sent in (("params", recorded["params"]), ("headers", {key.lower(): value for key, value in recorded["headers"].items()})):
+        dynamic = dynamic_map.get(field, {})
+
+        for key, value in expected[field].items():
+            value = str(args.get(dynamic[key])) if key in dynamic else value
+            lookup = key.lower() if field == "headers" else key
+
+            if sent.get(lookup) != value:
+                mismatches.append(f"{field}.{key}: expected {value!r}, sent {sent.get(lookup)!r}")
+
+    payload = expected["payload"]
+
+    if payload is not None:
+        if set(payload) == {"raw_data"}:
+            expected_body, body = payload["raw_data"], recorded["body"]
+        else:
+            expected_body = substitute(payload, dynamic_map.get("json", {}), args)
+
+            try:
+                body = json.loads(recorded["body"] or "null")
+            except ValueError:
+                body = recorded["body"]
+
+        if body != expected_body:
+            mismatches.append(f"body: expected {expected_body!r}, sent {body!r}")
+
+    return mismatches
+
+
+async def smoke_test(code: str, args: dict, curl_command: str = None, dynamic_map: dict = None, stub_response=None, stub_status: int = 200):
+    """ run a generated tool against a stub inside the sandbox; report latency, response shape & cURL conformance """
+    # only the rules guarding execution; parameter names like auth_token come straight from parse_curl's dynamic_map
+    errors = validate_function(code, check_credentials=False)
+
+    if errors:
+        # code that breaks the rules is never executed
+        return {"status": "invalid", "validation_errors": errors, "requests": []}
+
+    report = await run_in_sandbox(code, args, stub_response, stub_status)
+    requests = report["requests"]
+
+    if report["status"] == "ok":
+        report["response_shape"] = response_shape(report.get("return_value"))
+
+    if curl_command:
+        if not requests:
+            report["matches_curl"] = False
+            report["curl_mismatches"] = ["no HTTP request was sent"]
+        else:
+            mismatches = compare_with_curl(requests[0], curl_command, dynamic_map, args)
+            report["matches_curl"] = not mismatches
+            report["curl_mismatches"] = mismatches
+
+    return report
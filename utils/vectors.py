@@ -0,0 +1,104 @@
+import os
+import re
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+
+PROMPT_EMBEDDING_DIM = int(os.getenv("PROMPT_EMBEDDING_DIM", 128))
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """ offline embedder: signed feature hashing of word unigrams & bigrams with log scaled term frequency """
+
+    def __init__(self, dim: int = PROMPT_EMBEDDING_DIM):
+        self.dim = dim
+
+    def embed(self, text: str):
+        tokens = TOKEN_PATTERN.findall((text or "").lower())
+        features = Counter(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])])
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for feature, count in features.items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if hashed & 0x80000000 else -1.0
+            vector[hashed % self.dim] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """ unit vectors in one contiguous float32 matrix; top-k is a single mat-vec product """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.labels = np.zeros(capacity, dtype=np.int32)
+        self.label_codes = {}
+        self.ids = []
+        self.rows = {}
+
+    def label_code(self, label):
+        return self.label_codes.setdefault((label or "").lower(), len(self.label_codes))
+
+    def upsert(self, doc_id: str, vector, label: str):
+        row = self.rows.get(doc_id)
+
+        if row is None:
+            row = len(self.ids)
+
+            if row == len(self.vectors):
+                self.vectors = np.concatenate([self.vectors, np.zeros_like(self.vectors)])
+                self.labels = np.concatenate([self.labels, np.zeros_like(self.labels)])
+
+            self.ids.append(doc_id)
+            self.rows[doc_id] = row
+
+        self.vectors[row] = vector
+        self.labels[row] = self.label_code(label)
+
+    def set_label(self, doc_id: str, label: str):
+        if doc_id in self.rows:
+            self.labels[self.rows[doc_id]] = self.label_code(label)
+
+    def remove(self, doc_id: str):
+        """ swap the last row into the removed slot to keep the matrix dense """
+        row = self.rows.pop(doc_id, None)
+
+        if row is None:
+            return
+
+        last = len(self.ids) - 1
+        last_id = self.ids.pop()
+
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            self.labels[row] = self.labels[last]
+            self.ids[row] = last_id
+            self.rows[last_id] = row
+
+    def top_k(self, vector, k: int, label: str = None, exclude: str = None):
+        """ [(doc_id, cosine similarity)] of the k nearest vectors """
+        count = len(self.ids)
+
+        if count == 0 or k <= 0:
+            return []
+
+        scores = self.vectors[:count] @ vector
+
+        if label is not None:
+            code = self.label_codes.get(label.lower())
+            scores[self.labels[:count] != code] = -np.inf
+
+        if exclude in self.rows:
+            scores[self.rows[exclude]] = -np.inf
+
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(self.ids[row], float(scores[row])) for row in top if np.isfinite(scores[row])]